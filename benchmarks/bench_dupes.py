@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Benchmark for sanity_check_export duplicate filename detection, single process versus process pool
+# Copyright (C) 2024 Chris Clark - clach04
+"""Usage:
+
+    python benchmarks/bench_dupes.py [NUMBER_OF_NOTES] [WORKERS]
+
+Defaults to 1,000,000 notes and one worker per CPU. Uses safe_filename(),
+same as simplenote_export2txt. Results are checked against find_duplicate_filenames_dict().
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sanity_check_export
+import synthetic_export
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    try:
+        note_count = int(argv[1])
+    except IndexError:
+        note_count = 1000000
+    try:
+        workers = int(argv[2])
+    except IndexError:
+        workers = None
+
+    print('Python %s on %s' % (sys.version.replace('\n', ' '), sys.platform))
+    start_time = time.time()
+    notes_dict = synthetic_export.generate_notes_dict(note_count)
+    print('generated %d notes in %.2f seconds' % (note_count, time.time() - start_time))
+
+    start_time = time.time()
+    expected = sanity_check_export.find_duplicate_filenames_dict(notes_dict, generate_file_name=sanity_check_export.safe_filename)
+    single_duration = time.time() - start_time
+    print('%-24s %6.2f seconds, %d duplicate filenames' % ('single process', single_duration, len(expected)))
+
+    spill_directory = tempfile.mkdtemp(prefix='bench_dupes_')
+    try:
+        for description, directory in (('process pool', None), ('process pool, spill', spill_directory)):
+            start_time = time.time()
+            result = sanity_check_export.find_duplicate_filenames_dict_parallel(notes_dict, generate_file_name=sanity_check_export.safe_filename, workers=workers, spill_directory=directory)
+            duration = time.time() - start_time
+            print('%-24s %6.2f seconds, %.2fx' % (description, duration, single_duration / duration))
+            assert list(result.items()) == list(expected.items())
+    finally:
+        os.rmdir(spill_directory)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Benchmark for simplenote_ordering external merge sort versus in memory sort
+# Copyright (C) 2024 Chris Clark - clach04
+"""Usage:
+
+    python benchmarks/bench_ordering.py [NUMBER_OF_RECORDS] [RUN_SIZE]
+
+Defaults to 1,000,000 (timestamp, filename, operation) records, like import_files_to_git.py generates.
+Reports time to first record (i.e. when a git writer could start) and total time.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simplenote_ordering
+
+
+def generate_records(record_count, seed=1):
+    rand = random.Random(seed)
+    for record_number in range(record_count):
+        yield (1262304000 + rand.random() * 14 * 365 * 24 * 60 * 60, 'note_%08d.txt' % record_number, rand.choice(('CREATED', 'MODIFIED')))
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    try:
+        record_count = int(argv[1])
+    except IndexError:
+        record_count = 1000000
+    try:
+        run_size = int(argv[2])
+    except IndexError:
+        run_size = simplenote_ordering.DEFAULT_RUN_SIZE
+
+    print('Python %s on %s' % (sys.version.replace('\n', ' '), sys.platform))
+
+    start_time = time.time()
+    records = list(generate_records(record_count))
+    records.sort()
+    print('%-16s %d records in %.2f seconds (all held in memory)' % ('list sort', record_count, time.time() - start_time))
+    last_record = records[-1]
+    del records
+
+    start_time = time.time()
+    sorter = simplenote_ordering.ExternalSorter(run_size=run_size)
+    sorter.extend(generate_records(record_count))
+    run_count = len(sorter.run_filenames)
+    first_time = None
+    previous = None
+    for record in sorter:
+        if first_time is None:
+            first_time = time.time() - start_time
+        assert previous is None or previous <= record
+        previous = record
+    duration = time.time() - start_time
+    assert previous == last_record
+    print('%-16s %d records in %.2f seconds, %d runs of %d, first record after %.2f seconds' % ('external sort', record_count, duration, run_count, run_size, first_time))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
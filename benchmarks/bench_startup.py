@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Start up time benchmark for the command line tools
+# Copyright (C) 2024 Chris Clark - clach04
+"""Measure start up (import) time for the common command line paths
+
+    python benchmarks/bench_startup.py [number_of_runs]
+
+For each path reports:
+
+  * best wall clock time of running the subcommand with no arguments (i.e. import, print usage/fail, exit)
+  * cumulative import time, in micro seconds, of the top level module from `python -X importtime`
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+
+repo_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# label, module to import, command line arguments
+STARTUP_PATHS = [
+    ('python (baseline)', None, ['-c', 'pass']),
+    ('simplenote (usage)', 'simplenote', ['-m', 'simplenote']),
+    ('check', 'sanity_check_export', ['-c', 'import sanity_check_export']),
+    ('export2txt', 'simplenote_export2txt', ['-c', 'import simplenote_export2txt']),
+    ('json2yaml', 'simplenote_json2yaml', ['-c', 'import simplenote_json2yaml']),
+    ('simplenote export2txt', 'simplenote_export2txt', ['-c', 'import simplenote, simplenote_export2txt']),
+]
+
+
+def best_wall_time(arguments, number_of_runs):
+    result = None
+    for _dummy in range(number_of_runs):
+        start_time = time.time()
+        subprocess.call([sys.executable] + arguments, cwd=repo_directory, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        duration = time.time() - start_time
+        if result is None or duration < result:
+            result = duration
+    return result
+
+
+def import_time_us(module_name):
+    """Returns cumulative import time in micro seconds for module_name, from -X importtime
+    """
+    process = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', 'import %s' % module_name], cwd=repo_directory, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _stdout, stderr = process.communicate()
+    for line in stderr.decode('utf-8').splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module_name:
+            return int(fields[1])
+    return None
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    try:
+        number_of_runs = int(argv[1])
+    except IndexError:
+        number_of_runs = 10
+
+    print('Python %s on %s' % (sys.version.replace('\n', ' '), sys.platform))
+    print('%-24s %12s %16s' % ('path', 'best wall ms', 'import time us'))
+    for label, module_name, arguments in STARTUP_PATHS:
+        wall_time = best_wall_time(arguments, number_of_runs)
+        cumulative_us = None
+        if module_name:
+            import_time_us(module_name)  # warm up, .pyc files
+            cumulative_us = min(import_time_us(module_name) for _dummy in range(3))
+        print('%-24s %12.1f %16s' % (label, wall_time * 1000, cumulative_us))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Benchmark for simplenote_stats on synthetic exports
+# Copyright (C) 2024 Chris Clark - clach04
+"""Usage:
+
+    python benchmarks/bench_stats.py [NUMBER_OF_NOTES]
+
+Defaults to 1,000,000 notes.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simplenote_stats
+import synthetic_export
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    try:
+        note_count = int(argv[1])
+    except IndexError:
+        note_count = 1000000
+
+    print('Python %s on %s' % (sys.version.replace('\n', ' '), sys.platform))
+    start_time = time.time()
+    notes_dict = synthetic_export.generate_notes_dict(note_count)
+    print('generated %d notes in %.2f seconds' % (note_count, time.time() - start_time))
+
+    start_time = time.time()
+    stats_dict = simplenote_stats.notes_dict_stats(notes_dict)
+    duration = time.time() - start_time
+    print('stats for %d notes in %.2f seconds, %.0f notes/second' % (note_count, duration, note_count / duration))
+    print('%d truncated titles' % stats_dict['activeNotes']['truncated_titles']['count'])
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
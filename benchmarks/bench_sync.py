@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Benchmark simplenote_sync client against the local stand-in server
+# Copyright (C) 2024 Chris Clark - clach04
+"""Usage:
+
+    python benchmarks/bench_sync.py [NUMBER_OF_NOTES] [LATENCY_SECONDS]
+
+Fetches all notes from an in-process simplenote_sync_server, with and without
+content in the index (i.e. batched versus one request per note), over a range of
+connection counts, with every 50th request failing (to exercise retries).
+Then an incremental fetch after pushing an edit (with an old lastModified) and a
+deletion (without content), as simplenote_text_sync output would.
+Output is checked against the original notes.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simplenote_common
+import simplenote_sync
+import simplenote_sync_server
+import synthetic_export
+
+
+def export_ids(notes_dict):
+    return sorted(note_entry['id'] for note_entry in notes_dict['activeNotes']), sorted(note_entry['id'] for note_entry in notes_dict['trashedNotes'])
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    try:
+        note_count = int(argv[1])
+    except IndexError:
+        note_count = 2000
+    try:
+        latency = float(argv[2])
+    except IndexError:
+        latency = 0.002
+
+    print('Python %s on %s' % (sys.version.replace('\n', ' '), sys.platform))
+    notes_dict = synthetic_export.generate_notes_dict(note_count)
+    expected_ids = export_ids(notes_dict)
+    server = simplenote_sync_server.start_server(notes_dict, fail_every=50, latency=latency)
+    temp_directory = tempfile.mkdtemp()
+    try:
+        print('%d notes, %.1f ms server latency, every 50th request fails' % (note_count, latency * 1000))
+        print('%-10s %12s %10s %10s %12s %10s %12s' % ('index', 'connections', 'seconds', 'requests', 'connections', 'retries', 'notes/sec'))
+        for include_content in (True, False):
+            for max_connections in (1, 4, 16):
+                client = simplenote_sync.SimplenoteClient('user@example.com', password='x', api_url=server.base_url, max_connections=max_connections, backoff=0.01)
+                start_time = time.time()
+                api_notes = client.fetch_notes(include_content=include_content)
+                duration = time.time() - start_time
+                client.close()
+                result = simplenote_sync.merge_api_notes({'activeNotes': [], 'trashedNotes': []}, api_notes)
+                assert export_ids(result) == expected_ids
+                print('%-10s %12d %10.2f %10d %12d %10d %12.0f' % (include_content and 'data' or 'keys only', max_connections, duration, client.request_count, client.pool.created_count, client.retry_count, note_count / duration))
+
+        output_filename = os.path.join(temp_directory, 'sync.json')
+        client = simplenote_sync.SimplenoteClient('user@example.com', password='x', api_url=server.base_url, max_connections=4, backoff=0.01)
+        simplenote_sync.fetch_to_export(client, output_filename)
+        changed_note = dict(notes_dict['activeNotes'][0])
+        changed_note['content'] = 'changed\r\n'
+        changed_note['lastModified'] = '2024-01-01T00:00:00.000Z'  # older than the last fetch, e.g. file mtime from simplenote_text_sync
+        trashed_note = dict(notes_dict['activeNotes'][1])
+        trashed_note['content'] = ''  # simplenote_text_sync deletions have no content
+        client.push_notes({'activeNotes': [changed_note], 'trashedNotes': [trashed_note]})
+        start_time = time.time()
+        changed_count = simplenote_sync.fetch_to_export(client, output_filename)
+        duration = time.time() - start_time
+        client.close()
+        result = simplenote_common.load_file(output_filename)
+        active_ids, trashed_ids = expected_ids
+        assert export_ids(result) == ([note_id for note_id in active_ids if note_id != trashed_note['id']], sorted(trashed_ids + [trashed_note['id']]))
+        assert [note_entry['content'] for note_entry in result['activeNotes'] if note_entry['id'] == changed_note['id']] == ['changed\r\n']
+        assert [note_entry['content'] for note_entry in result['trashedNotes'] if note_entry['id'] == trashed_note['id']] == [notes_dict['activeNotes'][1]['content']]  # kept on server
+        print('incremental fetch, %d changed notes in %.3f seconds' % (changed_count, duration))
+    finally:
+        server.shutdown()
+        shutil.rmtree(temp_directory)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Benchmark for sanity_check_export.validate_notes_dict() on synthetic exports
+# Copyright (C) 2024 Chris Clark - clach04
+"""Usage:
+
+    python benchmarks/bench_validate.py [NUMBER_OF_NOTES]
+
+Defaults to 1,000,000 notes. A few broken notes are added, to check they are all reported.
+Validation time is compared with the time to parse the same export from json.
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sanity_check_export
+import synthetic_export
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    try:
+        note_count = int(argv[1])
+    except IndexError:
+        note_count = 1000000
+
+    print('Python %s on %s' % (sys.version.replace('\n', ' '), sys.platform))
+    start_time = time.time()
+    notes_dict = synthetic_export.generate_notes_dict(note_count)
+    print('generated %d notes in %.2f seconds' % (note_count, time.time() - start_time))
+
+    json_bytes = json.dumps(notes_dict).encode('utf-8')
+    start_time = time.time()
+    notes_dict = json.loads(json_bytes)
+    json_duration = time.time() - start_time
+    print('json parse in %.2f seconds' % json_duration)
+
+    start_time = time.time()
+    violations = sanity_check_export.validate_notes_dict(notes_dict)
+    duration = time.time() - start_time
+    print('validated %d notes in %.2f seconds, %.0f notes/second, %.0f%% of json parse time' % (note_count, duration, note_count / duration, 100 * duration / json_duration))
+    assert violations == [], violations[:10]
+
+    broken_notes = [
+        {'id': 'broken-1', 'content': 'no dates'},
+        {'id': 'broken-2', 'content': 'bad date\n', 'creationDate': '2022-06-27 01:39:12', 'lastModified': '2022-06-27T01:39:12.602Z'},
+        {'id': 'broken-3', 'content': 'bad tags\n', 'creationDate': '2022-06-27T01:39:12.602Z', 'lastModified': '2022-06-27T01:39:12.602Z', 'tags': ['ok', 1], 'pinned': 'yes'},
+        dict(notes_dict['activeNotes'][0]),  # duplicate id
+    ]
+    notes_dict['trashedNotes'].extend(broken_notes)
+    violations = sanity_check_export.validate_notes_dict(notes_dict)
+    sanity_check_export.report_on_violations(violations)
+    assert len(violations) == 6, violations
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Generate synthetic Simplenote exports for benchmarks
+# Copyright (C) 2024 Chris Clark - clach04
+"""Usage:
+
+    python benchmarks/synthetic_export.py OUTPUT_FILENAME.json [NUMBER_OF_NOTES]
+
+Notes are deterministic (fixed random seed) with a mix of; Windows and Unix
+newlines, single line notes, duplicate titles, long titles, tags, pinned and
+markdown flags.
+"""
+
+import json
+import random
+import sys
+import time
+import uuid
+
+
+WORDS = 'alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima mike november oscar papa quebec romeo sierra tango uniform victor whiskey xray yankee zulu'.split()
+TAGS = ['tag%d' % tag_number for tag_number in range(50)]
+
+
+def make_timestamp(secs):
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(secs)) + '.%03dZ' % (secs % 1000)
+
+def make_note(note_number, rand):
+    title_word_count = rand.choice((1, 2, 3, 5, 8, 40))  # 40 words gives long titles that get truncated
+    title = ' '.join(rand.choice(WORDS) for _dummy in range(title_word_count))
+    body_lines = [' '.join(rand.choice(WORDS) for _dummy in range(rand.randint(1, 12))) for _dummy in range(rand.choice((0, 1, 3, 10)))]
+    newline = rand.choice(('\r\n', '\n'))
+    content = newline.join([title] + body_lines)
+    created = 1262304000 + rand.randint(0, 14 * 365 * 24 * 60 * 60)  # 2010 onwards
+    note_entry = {
+        'id': str(uuid.UUID(int=rand.getrandbits(128), version=4)),
+        'content': content,
+        'creationDate': make_timestamp(created),
+        'lastModified': make_timestamp(created + rand.randint(0, 365 * 24 * 60 * 60)),
+    }
+    if rand.random() < 0.3:
+        note_entry['tags'] = rand.sample(TAGS, rand.randint(1, 3))
+    if rand.random() < 0.5:
+        note_entry['markdown'] = rand.random() < 0.2
+    if rand.random() < 0.02:
+        note_entry['pinned'] = True
+    return note_entry
+
+def generate_notes_dict(note_count, trashed_fraction=0.05, seed=1):
+    rand = random.Random(seed)
+    trashed_count = int(note_count * trashed_fraction)
+    return {
+        'activeNotes': [make_note(note_number, rand) for note_number in range(note_count - trashed_count)],
+        'trashedNotes': [make_note(note_number, rand) for note_number in range(trashed_count)],
+    }
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    output_filename = argv[1]
+    try:
+        note_count = int(argv[2])
+    except IndexError:
+        note_count = 1000
+    f = open(output_filename, 'wb')
+    f.write(json.dumps(generate_notes_dict(note_count)).encode('utf-8'))
+    f.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
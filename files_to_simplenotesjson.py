@@ -18,6 +18,8 @@ import sys
 import time
 import uuid
 
+import simplenote_common
+
 
 is_py3 = sys.version_info >= (3,)
 is_win = sys.platform.startswith('win')
@@ -57,26 +59,40 @@ def filename_to_entry(filename):
     return result
 
 
-filenames = pattern_to_file_list('*')
-
-now = datetime.datetime.now()
-output_filename = os.environ.get('SIMPLENOTE_EXPORT_FILENAME', 'simplenote_%s.json' % now.strftime('%Y%m%d_%H%M%S'))
-print('%d files to export' % len(filenames))
-print('to export %r' % output_filename)
-notes = []
-for filename in filenames:
-    print('%s' % filename)
-    notes.append(filename_to_entry(filename))
-
-simplenotes_dict = {
-    "activeNotes": notes,
-    "trashedNotes": [],  # NOTE required, web interface will silently crash if missing (error in debug console, but nothing in UI).
-}
-
-json_str = json.dumps(simplenotes_dict, indent=4)
-#print('%s' % json_str)
-#"""
-f = open(output_filename, 'wb')
-f.write(json_str.encode('utf-8'))
-f.close()
-#"""
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    filenames = pattern_to_file_list('*')
+
+    now = datetime.datetime.now()
+    output_filename = os.environ.get('SIMPLENOTE_EXPORT_FILENAME', 'simplenote_%s.json' % now.strftime('%Y%m%d_%H%M%S'))
+    print('%d files to export' % len(filenames))
+    print('to export %r' % output_filename)
+    notes = []
+    for filename in filenames:
+        print('%s' % filename)
+        notes.append(filename_to_entry(filename))
+
+    simplenotes_dict = {
+        "activeNotes": notes,
+        "trashedNotes": [],  # NOTE required, web interface will silently crash if missing (error in debug console, but nothing in UI).
+    }
+
+    if simplenote_common.is_ndjson_filename(output_filename):
+        simplenote_common.dump_ndjson(simplenotes_dict, output_filename)  # NOTE not for simplenote.com import, for other tools
+        return 0
+
+    json_str = json.dumps(simplenotes_dict, indent=4)
+    #print('%s' % json_str)
+    #"""
+    f = open(output_filename, 'wb')
+    f.write(json_str.encode('utf-8'))
+    f.close()
+    #"""
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,8 @@ import os
 import string
 import sys
 
+import simplenote_ordering
+
 is_win = sys.platform.startswith('win')
 
 CREATED = 'CREATED'
@@ -32,7 +34,7 @@ def generate_import_into_git_script(filename_list, comment_prefix=None):
             comment_prefix = 'REM'
     print('%s Python %s on %s' % (comment_prefix, sys.version.replace('\n', ' '), sys.platform.replace('\n', ' ')))
 
-    times_and_filenames = []
+    times_and_filenames = simplenote_ordering.ExternalSorter()  # bounded memory, sorted runs are written to temporary files
     for filename in filename_list:
         print('%s %r' % (comment_prefix, filename))
         if os.path.isdir(filename):
@@ -49,11 +51,11 @@ def generate_import_into_git_script(filename_list, comment_prefix=None):
         if 1 > (st_ctime - st_mtime):  # could make this more than one second
             st_mtime = st_ctime
         #print('%st%r' % (comment_prefix, st_ctime - st_mtime))
-        times_and_filenames.append((st_ctime, filename, CREATED))
+        times_and_filenames.add((st_ctime, filename, CREATED))
         if st_ctime != st_mtime:
-            times_and_filenames.append((st_mtime, filename, MODIFIED))
+            times_and_filenames.add((st_mtime, filename, MODIFIED))
 
-    times_and_filenames.sort()  # sort by timestamp
+    # sorted by timestamp when iterated
     #print('%s' % json.dumps(times_and_filenames, indent=4))  # DEBUG
     # Generate shell / batch script to stdout - assume now unicode filenames for Windows
     print('%s git init --separate-git-dir ../test_git.git' %(comment_prefix, ))
@@ -14,6 +14,8 @@ import os
 import string
 import sys
 
+import simplenote_ordering
+
 is_win = sys.platform.startswith('win')
 
 CREATED = 'CREATED'
@@ -27,7 +29,7 @@ def main(argv=None):
         comment_prefix = 'REM'
     print('%s Python %s on %s' % (comment_prefix, sys.version.replace('\n', ' '), sys.platform.replace('\n', ' ')))
     filename_list = glob.glob('*.txt')
-    times_and_filenames = []
+    times_and_filenames = simplenote_ordering.ExternalSorter()  # bounded memory, sorted runs are written to temporary files
     for filename in filename_list:
         #print('%r' % filename)
         fd = os.open(filename, os.O_RDONLY)
@@ -37,11 +39,11 @@ def main(argv=None):
         created_modified_times = [file_status.st_ctime, file_status.st_mtime]  # Under Microsoft Windows st_ctime is create time, Unix it is the time of the last metadata change
         created_modified_times.sort()
         st_ctime, st_mtime = created_modified_times
-        times_and_filenames.append((st_ctime, filename, CREATED))
+        times_and_filenames.add((st_ctime, filename, CREATED))
         if st_ctime != st_mtime:
-            times_and_filenames.append((st_mtime, filename, MODIFIED))
+            times_and_filenames.add((st_mtime, filename, MODIFIED))
 
-    times_and_filenames.sort()  # sort by timestamp
+    # sorted by timestamp when iterated
     #print('%s' % json.dumps(times_and_filenames, indent=4))  # DEBUG
     # Generate shell / batch script to stdout - assume now unicode filenames for Windows
     print('git init')
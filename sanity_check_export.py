@@ -10,6 +10,7 @@ Find problems:
 
   * duplicate filename
   * missing newline(s)
+  * invalid notes; missing/unexpected keys, wrong types, bad timestamps, duplicate ids (see validate_notes_dict())
 
 given zip file which is SimpleNote export (from the web version of Simplenote - https://simplenote.com/help/#export), locate duplicate notes/filenames.
 
@@ -24,11 +25,32 @@ NOTE ZIP export uses first line of note as filename, which may not be a valid fi
 
 """
 
+import collections
+import hashlib
 import json
 import os
-import string
+import pickle
+import re
 import sys
-from zipfile import ZipFile, ZIP_DEFLATED
+import zlib
+
+
+string_types = (type(u''), type(''))  # unicode and str under Python 2, str under Python 3
+
+TOP_LEVEL_KEYS = ('activeNotes', 'trashedNotes')
+REQUIRED_NOTE_KEYS = ('id', 'content', 'creationDate', 'lastModified')
+# note key -> (type(s), extra check); 'timestamp', 'nonempty', 'strings' (list of strings), or None
+NOTE_FIELD_CHECKS = {
+    'id': (string_types, 'nonempty'),  # appears to be UUID (UUID4?), old notes have no "-"
+    'content': (string_types, None),
+    'creationDate': (string_types, 'timestamp'),  # ISO/ANSI format string UTC
+    'lastModified': (string_types, 'timestamp'),  # ISO/ANSI format string UTC
+    'markdown': (bool, None),
+    'pinned': (bool, None),
+    'tags': (list, 'strings'),
+    'collaboratorEmails': (list, 'strings'),
+}
+TIMESTAMP_RE = re.compile(r'\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{1,6}Z\Z')  # e.g. "2022-06-27T01:39:12.602Z", see simplenote_common.iso_like2secs()
 
 
 def report_on_dupes(filename_dict):
@@ -39,6 +61,7 @@ def report_on_dupes(filename_dict):
 def check_notes_zip(archname, simulate=True):
     assert simulate
     filenames = {}
+    from zipfile import ZipFile  # only import when needed, start up time
     arch = ZipFile(archname, 'r')
     for orig_path in arch.namelist():
         filename = orig_path.lower()
@@ -55,6 +78,7 @@ def check_notes_zip(archname, simulate=True):
 def check_json_entries(archname, simulate=True):
     assert simulate
     #import pdb ; pdb.set_trace()
+    from zipfile import ZipFile  # only import when needed, start up time
     arch = ZipFile(archname, 'r')
     f = arch.open('source/notes.json')
     json_bytes = f.read()
@@ -62,6 +86,138 @@ def check_json_entries(archname, simulate=True):
     notes_dict = json.loads(json_bytes)
     check_notes_dict(notes_dict)
 
+def hash_note_content(content):
+    """sha1 hex of note content (string) with '\r' removed, i.e. newlines normalized
+    """
+    return hashlib.sha1(content.replace('\r', '').encode('utf-8')).hexdigest()
+
+def hash_zip_members(archname, member_names, chunk_size=64 * 1024):
+    """Returns list of (member_name, sha1 hex) for text files in zip, same normalization as hash_note_content()
+    Streams each member, nothing is extracted to disk. Opens its own ZipFile so can be called from multiple threads
+    """
+    result = []
+    from zipfile import ZipFile  # only import when needed, start up time
+    arch = ZipFile(archname, 'r')
+    for member_name in member_names:
+        content_hash = hashlib.sha1()
+        f = arch.open(member_name)
+        first_chunk = True
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            if first_chunk and data.startswith(b'\xef\xbb\xbf'):
+                data = data[3:]  # utf-8 BOM
+            first_chunk = False
+            content_hash.update(data.replace(b'\r', b''))  # safe for utf-8, '\r' byte never part of a multi-byte sequence
+        f.close()
+        result.append((member_name, content_hash.hexdigest()))
+    arch.close()
+    return result
+
+def verify_zip_text_files(archname, workers=None):
+    """Compare the text files in a (web) export zip with the notes in the embedded json (source/notes.json)
+    Text files are decompressed and hashed on a pool of worker threads (zlib and sha1 release the GIL).
+    Text files under trash/ are compared with trashedNotes, everything else with activeNotes.
+
+    Returns dict:
+        matched - list of (member_name, note_id) where content is identical, each note matched at most once (title match preferred)
+        mismatched - list of (member_name, [note_id, ...]) where name matches a note title but content differs
+        orphans - list of member_name with no matching note (or a further copy when every note with that content already has a file)
+        missing - list of (section, note_id) for notes with no text file
+    """
+    from zipfile import ZipFile  # only import when needed, start up time
+    arch = ZipFile(archname, 'r')
+    f = arch.open('source/notes.json')
+    json_bytes = f.read()
+    f.close()
+    member_infos = [zip_info for zip_info in arch.infolist() if zip_info.filename.lower().endswith('.txt') and not zip_info.filename.startswith('source/')]
+    arch.close()
+    notes_dict = json.loads(json_bytes)
+
+    # per section lookups; content hash -> note ids and (lower case) title -> note ids
+    hash_lookup = {}
+    title_lookup = {}
+    unseen = {}
+    for section in ('activeNotes', 'trashedNotes'):
+        hashes = hash_lookup[section] = {}
+        titles = title_lookup[section] = {}
+        for note_entry in notes_dict[section]:
+            content = note_entry['content']
+            hashes.setdefault(hash_note_content(content), []).append(note_entry['id'])
+            first_line = content.replace('\r', '').split('\n', 1)[0]
+            for title in (first_line.lower(), safe_filename(first_line).lower()):
+                id_list = titles.setdefault(title, [])
+                if note_entry['id'] not in id_list:
+                    id_list.append(note_entry['id'])
+            unseen[(section, note_entry['id'])] = True
+
+    # largest first so one big note does not end up last on a single worker
+    member_infos.sort(key=lambda zip_info: zip_info.file_size, reverse=True)
+    workers = workers or min(8, (os.cpu_count() if hasattr(os, 'cpu_count') else None) or 2)
+    work_lists = [[] for _dummy in range(workers)]
+    for member_count, zip_info in enumerate(member_infos):
+        work_lists[member_count % workers].append(zip_info.filename)
+    from multiprocessing.pool import ThreadPool  # only import when needed, start up time
+    pool = ThreadPool(workers)
+    try:
+        member_hashes = pool.map(lambda member_names: hash_zip_members(archname, member_names), [work_list for work_list in work_lists if work_list])
+    finally:
+        pool.close()
+        pool.join()
+
+    result = {
+        'matched': [],
+        'mismatched': [],
+        'orphans': [],
+        'missing': [],
+    }
+    members = []
+    for member_name, content_hash in (member_hash for worker_result in member_hashes for member_hash in worker_result):
+        section = 'activeNotes'
+        if member_name.startswith('trash/'):
+            section = 'trashedNotes'
+        title = os.path.basename(member_name)[:-len('.txt')].lower()
+        members.append((title not in title_lookup[section], member_name, section, title, content_hash))
+    members.sort()  # files named after a note title first, so "title (1).txt" copies do not take the note of "title.txt"
+    for _untitled, member_name, section, title, content_hash in members:
+        id_list = hash_lookup[section].get(content_hash)
+        if id_list:
+            # one note per text file, notes with identical content each need their own file
+            candidates = [note_id for note_id in id_list if (section, note_id) in unseen]
+            if candidates:
+                title_ids = title_lookup[section].get(title, [])
+                for note_id in candidates:
+                    if note_id in title_ids:
+                        break
+                else:
+                    note_id = candidates[0]
+                del unseen[(section, note_id)]
+                result['matched'].append((member_name, note_id))
+            else:
+                result['orphans'].append(member_name)  # extra copy, every note with this content already has a file
+            continue
+        id_list = title_lookup[section].get(title)
+        if id_list:
+            for note_id in id_list:
+                unseen.pop((section, note_id), None)
+            result['mismatched'].append((member_name, id_list))
+        else:
+            result['orphans'].append(member_name)
+    result['matched'].sort()
+    result['orphans'].sort()
+    result['missing'] = sorted(unseen.keys())
+    return result
+
+def report_on_verify(verify_result):
+    print('%d text files match json' % len(verify_result['matched']))
+    for member_name, id_list in verify_result['mismatched']:
+        print('content mismatch %r - %r' % (member_name, id_list))
+    for member_name in verify_result['orphans']:
+        print('orphan text file, not in json %r' % (member_name,))
+    for section, note_id in verify_result['missing']:
+        print('missing text file for %s %r' % (section, note_id))
+
 def safe_filename(filename, replacement_char='_', max_filename_length=100):
     """safe filename for almost any platform, NOTE filename NOT pathname
     does NOT handle paths, see blocked_filenames comments section below for details/example.
@@ -185,62 +341,303 @@ def find_duplicate_filenames_dict(notes_dict, generate_file_name=None, remove_un
     return filenames
 
 
+def note_first_line(note_entry):
+    """Same first line as find_duplicate_filenames_dict(), without removing '\\r' from all of the content
+    """
+    content = note_entry['content']
+    end_of_line = content.find('\n')
+    if end_of_line != -1:
+        content = content[:end_of_line]
+    return content.replace('\r', '')
+
+def duplicate_keys_chunk(job):
+    """Worker for find_duplicate_filenames_dict_parallel(), job is (generate_file_name, partition_count, [(position, first_line, id), ...])
+    Returns list of partitions, each a list of (position, lower case filename, filename, id)
+    NOTE partition uses crc32 not hash(), hash() of strings differs between processes
+    """
+    generate_file_name, partition_count, items = job
+    partitions = [[] for _dummy in range(partition_count)]
+    for position, filename, note_id in items:
+        if generate_file_name:
+            filename = generate_file_name(filename)
+        filename_lower = filename.lower()
+        partitions[zlib.crc32(filename_lower.encode('utf-8')) % partition_count].append((position, filename_lower, filename, note_id))
+    return partitions
+
+def duplicate_groups_partition(job):
+    """Worker for find_duplicate_filenames_dict_parallel(), job is (entries or spill filename, remove_unique_names_from_results)
+    Returns list of (first position, lower case filename, [(filename, id), ...])
+    """
+    entries, remove_unique_names_from_results = job
+    if not isinstance(entries, list):
+        filename = entries
+        entries = []
+        f = open(filename, 'rb')
+        try:
+            while True:
+                try:
+                    entries.extend(pickle.load(f))
+                except EOFError:
+                    break
+        finally:
+            f.close()
+    groups = {}
+    for position, filename_lower, filename, note_id in entries:
+        group = groups.get(filename_lower)
+        if group is None:
+            groups[filename_lower] = group = (position, filename_lower, [])
+        group[2].append((filename, note_id))
+    return [group for group in groups.values() if not remove_unique_names_from_results or len(group[2]) > 1]
+
+def imap_bounded(pool, function, jobs, max_pending):
+    """Like pool.imap(function, jobs) (results in job order) but only max_pending jobs are taken from jobs
+    and sent to workers at a time. pool.imap() reads all of jobs up front, which for a generator means holding every job in memory
+    """
+    pending = collections.deque()
+    for job in jobs:
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+        pending.append(pool.apply_async(function, (job,)))
+    while pending:
+        yield pending.popleft().get()
+
+def find_duplicate_filenames_dict_parallel(notes_dict, generate_file_name=None, remove_unique_names_from_results=True, workers=None, partition_count=None, chunk_size=10000, spill_directory=None):
+    """Same result (and order) as find_duplicate_filenames_dict() using a pool of worker processes,
+    worthwhile for very large exports when generate_file_name (e.g. safe_filename()) is used.
+    generate_file_name must be a module level function (pickled to send to worker processes).
+
+    Filenames are generated by workers in chunks and split into partitions by
+    (lower case) filename hash, each partition is then grouped by a worker and only duplicates returned.
+
+    If spill_directory is set, partitions are written to temporary files in that directory
+    (and removed after) instead of being held in memory. Combined with notes_dict['activeNotes']
+    being an iterator (e.g. from simplenote_ndjson.iter_ndjson_range()), memory use is bounded
+    by the chunk_size (at most 2 chunks per worker are in flight) and the largest partition, not the number of notes.
+    """
+    import multiprocessing  # only import when needed, start up time
+    workers = workers or multiprocessing.cpu_count()
+    partition_count = partition_count or workers * 4
+
+    def iter_jobs():
+        items = []
+        for position, note_entry in enumerate(notes_dict['activeNotes']):
+            items.append((position, note_first_line(note_entry), note_entry['id']))
+            if len(items) >= chunk_size:
+                yield (generate_file_name, partition_count, items)
+                items = []
+        if items:
+            yield (generate_file_name, partition_count, items)
+
+    pool = None
+    if workers > 1:
+        pool = multiprocessing.Pool(workers)
+    spill_files = []
+    try:
+        if pool:
+            partitioned_chunks = imap_bounded(pool, duplicate_keys_chunk, iter_jobs(), workers * 2)  # results in chunk order, so each partition stays in note order
+        else:
+            partitioned_chunks = (duplicate_keys_chunk(job) for job in iter_jobs())
+
+        if spill_directory:
+            import tempfile  # only import when needed, start up time
+            for partition_number in range(partition_count):
+                fd, filename = tempfile.mkstemp(prefix='dupes_%d_' % partition_number, suffix='.pickle', dir=spill_directory)
+                spill_files.append((os.fdopen(fd, 'wb'), filename))
+            for partitions in partitioned_chunks:
+                for (f, _filename), entries in zip(spill_files, partitions):
+                    if entries:
+                        pickle.dump(entries, f, pickle.HIGHEST_PROTOCOL)
+            for f, _filename in spill_files:
+                f.close()
+            jobs = [(filename, remove_unique_names_from_results) for _f, filename in spill_files]
+        else:
+            partitions_entries = [[] for _dummy in range(partition_count)]
+            for partitions in partitioned_chunks:
+                for partition_entries, entries in zip(partitions_entries, partitions):
+                    partition_entries.extend(entries)
+            jobs = [(partition_entries, remove_unique_names_from_results) for partition_entries in partitions_entries]
+            del partitions_entries
+
+        if pool:
+            partition_groups = pool.imap_unordered(duplicate_groups_partition, jobs)
+        else:
+            partition_groups = (duplicate_groups_partition(job) for job in jobs)
+        groups = []
+        for partition_group in partition_groups:
+            groups.extend(partition_group)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        for f, filename in spill_files:
+            f.close()
+            os.remove(filename)
+
+    groups.sort()  # first position, i.e. same order as find_duplicate_filenames_dict()
+    filenames = {}
+    for _position, filename_lower, id_list in groups:
+        filenames[filename_lower] = id_list
+    return filenames
+
+
+class NotesValidationError(ValueError):
+    def __init__(self, violations):
+        ValueError.__init__(self, '%d problems found in notes, first: %r' % (len(violations), violations[:1]))
+        self.violations = violations
+
+
+class NotesValidator(object):
+    """Validate every note in both sections, collects all problems in violations
+    as a list of (section, note id (or position if no usable id), message)
+
+    Per field checks are looked up once (from NOTE_FIELD_CHECKS) when created,
+    not for every note. Call top_level() once then note()/notes(), or use validate_notes_dict()
+    allow_unexpected_keys ignores keys not in field_checks (e.g. fields added by newer exports)
+    """
+    def __init__(self, field_checks=NOTE_FIELD_CHECKS, required_keys=REQUIRED_NOTE_KEYS, allow_unexpected_keys=False):
+        self.field_checks = dict(field_checks)
+        self.required_keys = frozenset(required_keys)
+        self.allow_unexpected_keys = allow_unexpected_keys
+        self.timestamp_match = TIMESTAMP_RE.match
+        self.violations = []
+        self.seen_ids = set()
+        self.positions = {}  # section -> number of notes seen
+
+    def top_level(self, notes_dict):
+        if not isinstance(notes_dict, dict):
+            self.violations.append((None, None, 'export is %s, not an object' % type(notes_dict).__name__))
+            return False
+        for key in sorted(set(notes_dict).symmetric_difference(TOP_LEVEL_KEYS)):
+            if key in notes_dict:
+                self.violations.append((None, None, 'unexpected top level key %r' % key))
+            else:
+                self.violations.append((None, None, 'missing top level key %r' % key))  # NOTE missing trashedNotes crashes the web interface on import
+        result = True
+        for section in TOP_LEVEL_KEYS:
+            if section in notes_dict and not isinstance(notes_dict[section], list):
+                self.violations.append((section, None, '%s is %s, not a list' % (section, type(notes_dict[section]).__name__)))
+                result = False
+        return result
+
+    def note(self, section, note_entry):
+        self.notes(section, (note_entry,))
+
+    def notes(self, section, note_entries):
+        """Check a sequence of notes from section, faster than calling note() for each one
+        """
+        violations = self.violations
+        seen_ids = self.seen_ids
+        seen_ids_add = seen_ids.add
+        required_keys = self.required_keys
+        get_check = self.field_checks.get
+        timestamp_match = self.timestamp_match
+        allow_unexpected_keys = self.allow_unexpected_keys
+        start = self.positions.get(section, 0)
+        position = start - 1
+        for position, note_entry in enumerate(note_entries, start):
+            if not isinstance(note_entry, dict):
+                violations.append((section, '#%d' % position, 'note is %s, not an object' % type(note_entry).__name__))
+                continue
+            note_id = note_entry.get('id')
+            if not note_id or not isinstance(note_id, string_types):
+                note_id = '#%d' % position
+            elif note_id in seen_ids:
+                violations.append((section, note_id, 'duplicate id'))
+            else:
+                seen_ids_add(note_id)
+
+            if not required_keys.issubset(note_entry):
+                for key in sorted(required_keys.difference(note_entry)):
+                    violations.append((section, note_id, 'missing key %r' % key))
+            for key, value in note_entry.items():
+                check = get_check(key)
+                if check is None:
+                    if not allow_unexpected_keys:
+                        violations.append((section, note_id, 'unexpected key %r' % key))
+                    continue
+                value_types, extra_check = check
+                if not isinstance(value, value_types):
+                    violations.append((section, note_id, '%s is %s' % (key, type(value).__name__)))
+                elif extra_check is None:
+                    continue
+                elif extra_check == 'timestamp':
+                    if not timestamp_match(value):
+                        violations.append((section, note_id, '%s invalid timestamp %r' % (key, value)))
+                elif extra_check == 'nonempty':
+                    if not value:
+                        violations.append((section, note_id, '%s is empty' % key))
+                elif extra_check == 'strings':
+                    for item in value:
+                        if not isinstance(item, string_types):
+                            violations.append((section, note_id, '%s contains %s %r' % (key, type(item).__name__, item)))
+        self.positions[section] = position + 1
+
+
+def validate_notes_dict(notes_dict, allow_unexpected_keys=False):
+    """Check top level keys, and keys and values of every note in both sections
+    Returns list of (section, note id, message), empty if no problems found
+    """
+    validator = NotesValidator(allow_unexpected_keys=allow_unexpected_keys)
+    if validator.top_level(notes_dict):
+        for section in TOP_LEVEL_KEYS:
+            validator.notes(section, notes_dict.get(section, []))
+    return validator.violations
+
+def report_on_violations(violations, max_report=100):
+    for section, note_id, message in violations[:max_report]:
+        print('%s %s: %s' % (section or '', note_id or '', message))
+    if len(violations) > max_report:
+        print('... and %d more' % (len(violations) - max_report))
+    print('%d problems found' % len(violations))
+
+def check_notes_dict_keys(notes_dict):
+    """Check top level keys and every note, also see check_notes_dict() and validate_notes_dict()
+    Returns list of problems, which are also printed
+    """
+    violations = validate_notes_dict(notes_dict)
+    report_on_violations(violations)
+    return violations
+
+def check_note_entry(note_entry, filenames):
+    """Check a single note, filenames is a dict that is updated with (lower case) first line -> list of (first line, id)
+    Also see check_notes_dict()
+    """
+    #print('%r' % note_entry)
+    #print('%s' % json.dumps(note_entry, indent=4))
+    content = note_entry['content']  # under Android content will only have '\n', Windows Native Application (and Windows browser) will have '\r' as well)
+    content = content.replace('\r', '')  # I don't use a Mac, I've no idea if this will break Mac
+    """
+    location_linefeed = content.find('\r')
+    location_newline = content.find('\n')
+    #assert -1 not in (location_linefeed, location_newline), (location_linefeed, location_newline, note_entry['id'], content[:100])
+    if -1  in (location_linefeed, location_newline):
+        print('missing newline/linefeed in content for %r' % ((location_linefeed, location_newline, note_entry['id'], content[:100]),))
+    orig_path = content.split('\r', 1)[0]  # TODO clean up \r and \n incase of problems?
+    """
+    location_newline = content.find('\n')
+    if -1 == location_newline:
+        print('missing newline in content for %r' % ((location_newline, note_entry['id'], content[:100]),))
+        #orig_path = content.split('\n', 1)[0]
+        #print('\t%r' % orig_path)
+    orig_path = content.split('\n', 1)[0]
+    #print('%r' % orig_path)
+    filename = orig_path.lower()
+    id_list = filenames.get(filename, [])
+    if id_list:
+        print('found a duplicate: lower: %r - %r and %r' % (filename, orig_path, filenames[filename]))
+    id_list.append((orig_path, note_entry['id']))
+    filenames[filename] = id_list
+
 def check_notes_dict(notes_dict):
     # also see find_duplicate_filenames_dict() and report_on_dupes()
-    top_level_keys = list(notes_dict.keys())
-    top_level_keys.sort()
-    top_level_keys_expected = [u'activeNotes', u'trashedNotes',]
-    top_level_keys_expected.sort()
-    print(top_level_keys)
-    assert top_level_keys == top_level_keys_expected
-    note_keys = list(notes_dict['activeNotes'][0].keys())
-    note_keys.sort()
-    note_keys_expected = [
-        'id',  # string - appears to be UUID (UUID4?)
-        'content',  # string
-        'creationDate',  # ISO/ANSI format string UTC
-        'lastModified',  # ISO/ANSI format string UTC
-        #'markdown',  # Boolean - NOTE optional?
-        #'tags',  # list/array of strings
-        #'collaboratorEmails',  # list/array of strings - emails
-    ]
-    if 'markdown' in note_keys:
-        note_keys_expected.append('markdown')
-    if 'tags' in note_keys:
-        note_keys_expected.append('tags')
-    if 'collaboratorEmails' in note_keys:
-        note_keys_expected.append('collaboratorEmails')
-    note_keys_expected.sort()
-    assert note_keys_expected == note_keys, (note_keys_expected, note_keys)
+    check_notes_dict_keys(notes_dict)
 
     # check each note
     filenames = {}
-    for note_entry in notes_dict['activeNotes']:
-        #print('%r' % note_entry)
-        #print('%s' % json.dumps(note_entry, indent=4))
-        content = note_entry['content']  # under Android content will only have '\n', Windows Native Application (and Windows browser) will have '\r' as well)
-        content = content.replace('\r', '')  # I don't use a Mac, I've no idea if this will break Mac
-        """
-        location_linefeed = content.find('\r')
-        location_newline = content.find('\n')
-        #assert -1 not in (location_linefeed, location_newline), (location_linefeed, location_newline, note_entry['id'], content[:100])
-        if -1  in (location_linefeed, location_newline):
-            print('missing newline/linefeed in content for %r' % ((location_linefeed, location_newline, note_entry['id'], content[:100]),))
-        orig_path = content.split('\r', 1)[0]  # TODO clean up \r and \n incase of problems?
-        """
-        location_newline = content.find('\n')
-        if -1 == location_newline:
-            print('missing newline in content for %r' % ((location_newline, note_entry['id'], content[:100]),))
-            #orig_path = content.split('\n', 1)[0]
-            #print('\t%r' % orig_path)
-        orig_path = content.split('\n', 1)[0]
-        #print('%r' % orig_path)
-        filename = orig_path.lower()
-        id_list = filenames.get(filename, [])
-        if id_list:
-            print('found a duplicate: lower: %r - %r and %r' % (filename, orig_path, filenames[filename]))
-        id_list.append((orig_path, note_entry['id']))
-        filenames[filename] = id_list
+    for note_entry in notes_dict.get('activeNotes', []):
+        if not isinstance(note_entry, dict) or not isinstance(note_entry.get('content'), string_types):
+            continue  # already reported by check_notes_dict_keys()
+        check_note_entry(note_entry, filenames)
     print('*' * 34)
     report_on_dupes(filenames)
 
@@ -262,6 +659,11 @@ def main(argv=None):
         print('Checking json')
         print('-' * 65)
         check_json_entries(filename, simulate)
+        if argv[2:3] == ['verify']:
+            print('-' * 65)
+            print('Verifying text files in zip against json')
+            print('-' * 65)
+            report_on_verify(verify_zip_text_files(filename))
     else:
         # lets assumes it is a json file
         print('Checking json ONLY')
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Single entry point for all the Simplenote tools
+# Copyright (C) 2024 Chris Clark - clach04
+"""Usage:
+
+    python -m simplenote SUBCOMMAND [arguments for subcommand...]
+    python simplenote.py SUBCOMMAND [arguments for subcommand...]
+
+Each subcommand is the main() of one of the scripts in this directory, which
+is only imported when the subcommand is run. Keep imports in this module to
+the bare minimum, start up time matters (check with `python -X importtime -m simplenote`).
+"""
+
+import sys
+
+
+# subcommand name -> (module name, description)
+SUBCOMMANDS = {
+    'check': ('sanity_check_export', 'find potential problems in an export, zip or json'),
+    'export2txt': ('simplenote_export2txt', 'convert export to text files (optionally git)'),
+    'json2yaml': ('simplenote_json2yaml', 'convert export to (id sorted) YAML, requires pyyaml'),
+    'files2json': ('files_to_simplenotesjson', 'generate json for import from *.txt and *.md files in current directory'),
+    'text-sync': ('simplenote_text_sync', 'generate import json with only the notes edited/added/deleted since a text export'),
+    'import-dirs-to-git': ('import_dirs_to_git', 'generate script to import files into git in time order'),
+    'import-files-to-git': ('import_files_to_git', 'generate script to import *.txt files into git in time order'),
+    'watch': ('simplenote_watch', 'watch a directory for new exports and export to text'),
+    'snapshot': ('simplenote_snapshot_store', 'content addressed store for many exports'),
+    'index': ('simplenote_index', 'convert/query binary index'),
+    'git-history': ('simplenote_git_history', 'git fast-import stream of note history across many exports'),
+    'stats': ('simplenote_stats', 'note statistics; sizes, tags, dates, newlines, truncated titles'),
+    'pipeline': ('simplenote_pipeline', 'load export once, check and write text/index/yaml/git in one pass'),
+    'ndjson': ('simplenote_ndjson', 'convert export to/from NDJSON (one note per line), parallel processing of large NDJSON files'),
+    'sync': ('simplenote_sync', 'fetch/push notes from/to a Simplenote server, output in export format'),
+    'sync-server': ('simplenote_sync_server', 'local stand-in Simplenote server, for offline testing'),
+}
+
+
+def usage(program_name):
+    print('Usage: %s SUBCOMMAND [arguments...]' % program_name)
+    print('')
+    print('Subcommands:')
+    for subcommand in sorted(SUBCOMMANDS):
+        print('    %-20s %s' % (subcommand, SUBCOMMANDS[subcommand][1]))
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    program_name = 'python -m simplenote'
+    try:
+        subcommand = argv[1]
+    except IndexError:
+        usage(program_name)
+        return 1
+    if subcommand not in SUBCOMMANDS:
+        if subcommand not in ('-h', '--help', 'help'):
+            print('unknown subcommand %r' % subcommand)
+        usage(program_name)
+        return 1
+
+    module_name = SUBCOMMANDS[subcommand][0]
+    module = __import__(module_name)  # lazy, only the module (and its dependencies) for this subcommand
+    return module.main(['%s %s' % (program_name, subcommand)] + argv[2:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,13 +5,14 @@
 # Utility functions for SimpleNote json export files
 # Copyright (C) 2024 Chris Clark - clach04
 
-import email.utils
+import calendar
 import datetime
+import gzip
 import json
 import os
-import string
 import sys
-from zipfile import ZipFile, ZIP_DEFLATED
+
+import sanity_check_export
 
 
 is_win = sys.platform.startswith('win')
@@ -40,7 +41,7 @@ def iso_like2datetime_local(datetime_str):
     dst = -1
     tz_offset = 0
     date_tuple = d.year, d.month, d.day, d.hour, d.minute, d.second, d.microsecond, 1, dst,tz_offset  # UTC offset
-    utctimestamp = email.utils.mktime_tz(date_tuple)
+    utctimestamp = calendar.timegm(date_tuple) - tz_offset  # same as email.utils.mktime_tz() without importing email package
     return datetime.datetime.fromtimestamp(utctimestamp)
 
 def iso_like2secs(datetime_str):
@@ -53,7 +54,7 @@ def iso_like2secs(datetime_str):
     d = datetime.datetime.strptime(datetime_str, '%Y-%m-%dT%H:%M:%S.%f')  # UTC relative datetime
     # generate tuple like the one returned by email.utils.parsedate_tz()
     date_tuple = d.year, d.month, d.day, d.hour, d.minute, d.second, d.microsecond, 1, -1, 0  # UTC offset
-    utctimestamp = email.utils.mktime_tz(date_tuple)
+    utctimestamp = calendar.timegm(date_tuple)  # same as email.utils.mktime_tz() for UTC offset 0
     return utctimestamp
 
 def force_bool(in_bool):
@@ -66,8 +67,71 @@ def force_bool(in_bool):
         return True
 
 
-def load_file(filename):
-    """zip with json (*.txt files are IGNORED) or plain json
+NDJSON_EXTENSIONS = ('.ndjson', '.ndjson.gz')
+NDJSON_TRASHED_KEY = 'trashed'  # NDJSON only, marks notes from trashedNotes
+
+def is_ndjson_filename(filename):
+    return filename.lower().endswith(NDJSON_EXTENSIONS)
+
+def open_ndjson(filename, mode='rb'):
+    """Open (binary mode) NDJSON file, gzip compressed if filename ends with .gz
+    """
+    if filename.lower().endswith('.gz'):
+        return gzip.open(filename, mode)
+    return open(filename, mode)
+
+def ndjson_line_to_note(line):
+    """Returns (section, note_entry) for a (bytes) line from a NDJSON file, or (None, None) for a blank line
+    """
+    line = line.strip()
+    if not line:
+        return None, None
+    note_entry = json.loads(line.decode('utf-8'))
+    if note_entry.pop(NDJSON_TRASHED_KEY, False):
+        return 'trashedNotes', note_entry
+    return 'activeNotes', note_entry
+
+def note_to_ndjson_line(note_entry, trashed=False):
+    """Returns (bytes) line, including newline, for a NDJSON file
+    """
+    if trashed:
+        note_entry = dict(note_entry)
+        note_entry[NDJSON_TRASHED_KEY] = True
+    return json.dumps(note_entry, sort_keys=True, separators=(',', ':')).encode('utf-8') + b'\n'  # ascii only output, so content newlines are always escaped
+
+def load_ndjson(filename):
+    """NDJSON, one note per line, optionally gzip compressed. Returns same format as load_file()
+    """
+    notes_dict = {
+        'activeNotes': [],
+        'trashedNotes': [],
+    }
+    f = open_ndjson(filename)
+    try:
+        for line in f:
+            section, note_entry = ndjson_line_to_note(line)
+            if section:
+                notes_dict[section].append(note_entry)
+    finally:
+        f.close()
+    return notes_dict
+
+def dump_ndjson(notes_dict, filename):
+    """Write notes_dict (same format as load_file()) as NDJSON, active notes first then trashed notes
+    """
+    f = open_ndjson(filename, 'wb')
+    try:
+        for note_entry in notes_dict['activeNotes']:
+            f.write(note_to_ndjson_line(note_entry))
+        for note_entry in notes_dict['trashedNotes']:
+            f.write(note_to_ndjson_line(note_entry, trashed=True))
+    finally:
+        f.close()
+
+
+def load_file(filename, validate=False):
+    """zip with json (*.txt files are IGNORED), plain json, or NDJSON (see load_ndjson())
+    If validate is True, every note is checked and sanity_check_export.NotesValidationError raised for any problems
 
     Expect a schema like:
         {
@@ -93,8 +157,13 @@ def load_file(filename):
       * looks like newlines for content are Windows (simplenote.com seems to accept unix)
       * id/uuid may or maynot have "-" character, but tends to have it (very old entries do not)
           * on import UUID ignored and likely to be replaced by simplenote.com
+      * NDJSON is one note per line (same keys as above), trashed notes have an extra "trashed": true
     """
-    if filename.lower().endswith('.json'):
+    if is_ndjson_filename(filename):
+        print('Extracting from NDJSON file')
+        print('-' * 65)
+        notes_dict = load_ndjson(filename)
+    elif filename.lower().endswith('.json'):
         print('Extracting from Simplenote raw json file')
         print('-' * 65)
         f = open(filename, 'rb')
@@ -103,6 +172,7 @@ def load_file(filename):
         notes_dict = json.loads(json_bytes)
     else:
         # assume a zip file
+        from zipfile import ZipFile  # only import when needed, start up time
         print('Extracting from Simplenote json in zip')
         print('-' * 65)
         arch = ZipFile(filename, 'r')
@@ -110,6 +180,10 @@ def load_file(filename):
         json_bytes = f.read()
         f.close()
         notes_dict = json.loads(json_bytes)
+    if validate:
+        violations = sanity_check_export.validate_notes_dict(notes_dict)
+        if violations:
+            raise sanity_check_export.NotesValidationError(violations)
     return notes_dict
 
 def export_to_uuid_dict(notes_dict):
@@ -18,96 +18,129 @@ Possible future TODO items:
 
 """
 
-import datetime
-import email.utils
 import json
 import os
-import string
 import sys
 import time
-from zipfile import ZipFile, ZIP_DEFLATED
-
-is_win = sys.platform.startswith('win')
-
-try:
-    # NOTE as of 2023-08-12 latest Dulwich (0, 20, 2) appears to need Python 3.7+
-    import dulwich  # pip install dulwich==0.19.16 --global-option="--pure"
-    import dulwich.repo
-except ImportError:
-    dulwich = None
-
-try:
-    #python -m pip install pywin32 --upgrade
-    import pywintypes
-    import win32con
-    import win32file
-    # Alternatively checkout:
-    #   * https://github.com/Delgan/win32-setctime BUT requires Python 3.5+
-    #   * https://github.com/kubinka0505/filedate BUT requires Python 3.4+
-
-    def windows_set_create_time(fname, newtime):
-        wintime = pywintypes.Time(newtime)
-        winfile = win32file.CreateFile(
-            fname, win32con.GENERIC_WRITE,
-            win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
-            None, win32con.OPEN_EXISTING,
-            win32con.FILE_ATTRIBUTE_NORMAL, None)
-
-        win32file.SetFileTime(winfile, wintime, None, None)
-
-        winfile.close()
-except ImportError:
-    # Either not Windows or missing extensions
-    windows_set_create_time = None
-    if is_win:
-        # TODO log warning
-        print('WARNING Windows, but missing pywin32, unable to set file creation time')
-
 
+from simplenote_common import force_bool, is_win, iso_like2datetime_local, iso_like2secs, load_file, safe_mkdir  # NOTE re-exported, used to be defined here
+from simplenote_common import dump_ndjson
 import sanity_check_export
+import simplenote_index
+import simplenote_ordering
 
 
-def safe_mkdir(newdir):
-    result_dir = os.path.abspath(newdir)
+dulwich = None  # imported on demand, see import_dulwich()
+
+def import_dulwich():
+    """Dulwich is only needed (and only imported) when exporting to git
+    """
+    global dulwich
+    if dulwich is None:
+        # NOTE as of 2023-08-12 latest Dulwich (0, 20, 2) appears to need Python 3.7+
+        import dulwich  # pip install dulwich==0.19.16 --global-option="--pure"
+        import dulwich.repo
+    return dulwich
+
+
+windows_set_create_time = None
+if is_win:
     try:
-        os.makedirs(result_dir)
-    except OSError as info:
-        if info.errno == 17 and os.path.isdir(result_dir):
-            pass
-        else:
-            raise
-
-def iso_like2datetime_local(datetime_str):
-    """Partial ISO date format parsing, very limited.
-    Focused on Simplenote timestamps format which are UTC / Zulu / GMT0 based.
-    For example; "2022-06-27T01:39:12.602Z" and "2012-02-22T15:15:19.602Z"
-    Returns relative to local timezone (what ever that maybe), no support for other timezones
+        #python -m pip install pywin32 --upgrade
+        import pywintypes
+        import win32con
+        import win32file
+        # Alternatively checkout:
+        #   * https://github.com/Delgan/win32-setctime BUT requires Python 3.5+
+        #   * https://github.com/kubinka0505/filedate BUT requires Python 3.4+
+
+        def windows_set_create_time(fname, newtime):
+            wintime = pywintypes.Time(newtime)
+            winfile = win32file.CreateFile(
+                fname, win32con.GENERIC_WRITE,
+                win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+                None, win32con.OPEN_EXISTING,
+                win32con.FILE_ATTRIBUTE_NORMAL, None)
+
+            win32file.SetFileTime(winfile, wintime, None, None)
+
+            winfile.close()
+    except ImportError:
+        # missing extensions
+        # TODO log warning
+        print('WARNING Windows, but missing pywin32, unable to set file creation time')
+
+
+def note_to_filename(note_entry, dupe_dict, use_first_line_as_filename=False, file_extension='txt'):
+    """Returns tuple of (filename, safe_filename) for a note, where note content has already had '\r' removed.
+    filename is the name on disk, safe_filename is the (made safe) first line as recorded in the index.
+    dupe_dict is the result of sanity_check_export.find_duplicate_filenames_dict()
     """
-    assert datetime_str.endswith('Z')  # FIXME add a check, this can be optimized out
-    datetime_str = datetime_str[:-1]  # strip UTC indicator
-    d = datetime.datetime.strptime(datetime_str, '%Y-%m-%dT%H:%M:%S.%f')  # UTC relative datetime
-    # generate tuple like the one returned by email.utils.parsedate_tz()
-    # Daylight Saving Time flag is set to -1, since DST is unknown.
-    dst = -1
-    tz_offset = 0
-    date_tuple = d.year, d.month, d.day, d.hour, d.minute, d.second, d.microsecond, 1, dst,tz_offset  # UTC offset
-    utctimestamp = email.utils.mktime_tz(date_tuple)
-    return datetime.datetime.fromtimestamp(utctimestamp)
-
-def iso_like2secs(datetime_str):
-    """Partial ISO date format parsing, very limited.
-    Focused on Simplenote timestamps format which are UTC / Zulu / GMT0 based.
-    For example; "2022-06-27T01:39:12.602Z" and "2012-02-22T15:15:19.602Z"
+    filename = note_entry['id']
+    first_line = note_entry['content'].split('\n', 1)[0]
+    safe_filename = sanity_check_export.safe_filename(first_line)
+    if safe_filename.lower() in dupe_dict:
+        safe_filename = 'dupe__' + safe_filename.lower() + '__' + note_entry['id']  # TODO review if should use lower in generated final name for dupes?
+    if use_first_line_as_filename:
+        filename = safe_filename
+
+    # TODO check for markdown and potentially change/set file_extension?
+    if file_extension:
+        filename = filename + '.' + file_extension
+    return filename, safe_filename
+
+def note_to_index_entry(note_entry, safe_filename, filename=None):
+    """Returns new dict of note metadata for the index, without content.
+    Adds "filename" (safe_filename, see note_to_filename()), "path" (filename, name on disk, if given),
+    and "content_sha1", hash of content with '\r' removed (used to detect edits to text files)
     """
-    assert datetime_str.endswith('Z')  # FIXME add a check, this can be optimized out
-    datetime_str = datetime_str[:-1]  # strip UTC indicator
-    d = datetime.datetime.strptime(datetime_str, '%Y-%m-%dT%H:%M:%S.%f')  # UTC relative datetime
-    # generate tuple like the one returned by email.utils.parsedate_tz()
-    date_tuple = d.year, d.month, d.day, d.hour, d.minute, d.second, d.microsecond, 1, -1, 0  # UTC offset
-    utctimestamp = email.utils.mktime_tz(date_tuple)
-    return utctimestamp
-
-def dict2txt(notes_dict, output_directory='notes_export_dir', use_first_line_as_filename=False, file_extension='txt', save_index=True, use_git=False, save_index_include_trashed=True):
+    index_entry = dict((key, value) for key, value in note_entry.items() if key != 'content')
+    index_entry['filename'] = safe_filename
+    if filename is not None:
+        index_entry['path'] = filename
+    index_entry['content_sha1'] = sanity_check_export.hash_note_content(note_entry['content'])
+    return index_entry
+
+def write_note_file(filename_full, note_entry):
+    """Write note content to disk and set file timestamp(s) based on note metadata.
+    Returns last modified time in seconds
+    """
+    st_atime = time.time()  # current time for; Time of most recent access expressed in seconds.
+    st_mtime = iso_like2secs(note_entry['lastModified'])  # Time of most recent content modification expressed in seconds.
+    if windows_set_create_time:
+        created_time = iso_like2secs(note_entry['creationDate'])
+    f = open(filename_full, 'wb')
+    f.write(note_entry['content'].encode('utf-8'))
+    f.close()
+    # modify file timestamp(s)
+    os.utime(filename_full, (st_atime, st_mtime))
+    if windows_set_create_time:
+        #
+        windows_set_create_time(filename_full, created_time)
+    return st_mtime
+
+def write_index_file(new_index, output_directory, index_format='json'):
+    """index_format is one of:
+        json - simplenote_index.json, human readable
+        binary - simplenote_index.snidx, random access, see simplenote_index.py
+        ndjson - simplenote_index.ndjson, one note per line, see simplenote_common.load_ndjson()
+    """
+    if index_format == 'binary':
+        simplenote_index.write_binary_index(new_index, os.path.join(output_directory, simplenote_index.BINARY_INDEX_FILENAME))
+        return
+    if index_format == 'ndjson':
+        notes_dict = {
+            'activeNotes': [new_index['activeNotes'][note_id] for note_id in sorted(new_index['activeNotes'])],
+            'trashedNotes': new_index.get('trashedNotes', []),
+        }
+        dump_ndjson(notes_dict, os.path.join(output_directory, simplenote_index.NDJSON_INDEX_FILENAME))
+        return
+    filename = os.path.join(output_directory, simplenote_index.JSON_INDEX_FILENAME)
+    f = open(filename, 'wb')
+    f.write(json.dumps(new_index, sort_keys=True, indent=1).encode('utf-8'))  # small indent and sorted keys for debugging purposes
+    f.close()
+
+def dict2txt(notes_dict, output_directory='notes_export_dir', use_first_line_as_filename=False, file_extension='txt', save_index=True, use_git=False, save_index_include_trashed=True, index_format='json'):
     #import pdb ; pdb.set_trace()
     dupe_dict = sanity_check_export.find_duplicate_filenames_dict(notes_dict, generate_file_name=sanity_check_export.safe_filename)
     if save_index:
@@ -115,70 +148,41 @@ def dict2txt(notes_dict, output_directory='notes_export_dir', use_first_line_as_
             'activeNotes': {},  # this will be the note metadata without the content (and additional "filename")
         }
         if save_index_include_trashed:
-            new_index['trashedNotes'] = notes_dict['trashedNotes'],  # include trashed/deleted notes, including actual content
+            new_index['trashedNotes'] = notes_dict['trashedNotes']  # include trashed/deleted notes, including actual content
 
     safe_mkdir(output_directory)
     if use_git:
+        import_dulwich()
         repo = dulwich.repo.Repo.init(output_directory)  # create new git repo
+        commits = simplenote_ordering.ExternalSorter()  # (last modified, note count, filename, commit message), committed in time order after all files are written
 
     notes = {}
     # TODO progress bar?
     for note_count, note_entry in enumerate(notes_dict['activeNotes']):
         # handle platform format differences with newlines/linefeeds
         note_entry['content'] = note_entry['content'].replace('\r', '')  # I don't use an Apple Mac, I've no idea if this will break OS X - works for Windows, Linux, and Android
-        filename = note_entry['id']
-        first_line = note_entry['content'].split('\n', 1)[0]
-        safe_filename = sanity_check_export.safe_filename(first_line)
-        if safe_filename.lower() in dupe_dict:
-            safe_filename = 'dupe__' + safe_filename.lower() + '__' + note_entry['id']  # TODO review if should use lower in generated final name for dupes?
-        if use_first_line_as_filename:
-            filename = safe_filename
-
-        # TODO check for markdown and potentially change/set file_extension?
-        if file_extension:
-            filename = filename + '.' + file_extension
+        filename, safe_filename = note_to_filename(note_entry, dupe_dict, use_first_line_as_filename=use_first_line_as_filename, file_extension=file_extension)
         filename_full = os.path.join(output_directory, filename)
-        st_atime = time.time()  # current time for; Time of most recent access expressed in seconds.
-        st_mtime = iso_like2secs(note_entry['lastModified'])  # Time of most recent content modification expressed in seconds.
-        if windows_set_create_time:
-            created_time = iso_like2secs(note_entry['creationDate'])
-        f = open(filename_full, 'wb')
-        f.write(note_entry['content'].encode('utf-8'))
-        f.close()
-        # modify file timestamp(s)
-        os.utime(filename_full, (st_atime, st_mtime))
-        if windows_set_create_time:
-            #
-            windows_set_create_time(filename_full, created_time)
+        st_mtime = write_note_file(filename_full, note_entry)
 
         if save_index:
-            del note_entry['content']
-            note_entry['filename'] = safe_filename
+            note_entry = note_to_index_entry(note_entry, safe_filename, filename=filename)
             new_index['activeNotes'][note_entry['id']] = note_entry
 
         if use_git:
-            repo.stage([filename.encode('utf-8')])
             #commit_message = safe_filename
             commit_message = 'Note id=%s\n\n%s\n' % (note_entry['id'], json.dumps(note_entry, indent=1))
-            # NOTE committing files in the order seen, not in date order
-            commit_id = repo.do_commit(commit_message.encode('utf-8'), author=b"Some User <email@address.domain>", commit_timestamp=st_mtime, commit_timezone=0)  # TODO pick up author from env (and document it)
+            commits.add((st_mtime, note_count, filename, commit_message))
             #if note_count >= 3: break  # DEBUG for performance
 
-    if save_index:
-        filename = os.path.join(output_directory, 'simplenote_index.json')
-        f = open(filename, 'wb')
-        f.write(json.dumps(new_index, sort_keys=True, indent=1).encode('utf-8'))  # small indent and sorted keys for debugging purposes
-        f.close()
-
+    if use_git:
+        # commit in last modified order, not the order seen in the export
+        for st_mtime, _note_count, filename, commit_message in commits:
+            repo.stage([filename.encode('utf-8')])
+            commit_id = repo.do_commit(commit_message.encode('utf-8'), author=b"Some User <email@address.domain>", commit_timestamp=st_mtime, commit_timezone=0)  # TODO pick up author from env (and document it)
 
-def force_bool(in_bool):
-    """Force string value into a Python boolean value
-    Everything is True with the exception of; false, off, no, and 0"""
-    value = str(in_bool).lower()
-    if value in ('false', 'off', 'no', '0'):
-        return False
-    else:
-        return True
+    if save_index:
+        write_index_file(new_index, output_directory, index_format=index_format)
 
 
 def main(argv=None):
@@ -195,11 +199,13 @@ def main(argv=None):
         use_first_line_as_filename = True
     except IndexError:
         use_first_line_as_filename = os.environ.get('SIMPLENOTE_READABLE_FILENAMES')
-    use_git = force_bool(os.environ.get('SIMPLENOTE_USE_GIT'))  # NOTE this generates commit order which confuses GitJournal and is VERY slow (with Dulwich)
+    use_git = force_bool(os.environ.get('SIMPLENOTE_USE_GIT', False))  # NOTE this is VERY slow (with Dulwich), commits are in last modified order
     #use_git = True  # DEBUG - this is VERY slow
 
     save_index = force_bool(os.environ.get('SIMPLENOTE_SAVE_INDEX', True))  # default is to save everything
     save_index_include_trashed = force_bool(os.environ.get('SIMPLENOTE_SAVE_INDEX_TRASHED', True))  # default is to save everything
+    index_format = os.environ.get('SIMPLENOTE_INDEX_FORMAT', 'json')  # json, ndjson, or binary
+    validate = force_bool(os.environ.get('SIMPLENOTE_VALIDATE', False))  # check every note before writing anything
 
     """setting env vars:
 
@@ -207,6 +213,8 @@ def main(argv=None):
         export SIMPLENOTE_USE_GIT=true
         export SIMPLENOTE_SAVE_INDEX=false
         export SIMPLENOTE_SAVE_INDEX_TRASHED=false
+        export SIMPLENOTE_INDEX_FORMAT=binary
+        export SIMPLENOTE_VALIDATE=true
 
         env SIMPLENOTE_READABLE_FILENAMES=true SIMPLENOTE_USE_GIT=true python simplenote_export2txt.py export_filename
 
@@ -214,26 +222,13 @@ def main(argv=None):
         set SIMPLENOTE_USE_GIT=true
         set SIMPLENOTE_SAVE_INDEX=false
         set SIMPLENOTE_SAVE_INDEX_TRASHED=false
+        set SIMPLENOTE_INDEX_FORMAT=binary
+        set SIMPLENOTE_VALIDATE=true
 
     """
 
-    if filename.lower().endswith('.json'):
-        print('Extracting from Simplenote raw json file')
-        print('-' * 65)
-        f = open(filename, 'rb')
-        json_bytes = f.read()
-        f.close()
-        notes_dict = json.loads(json_bytes)
-    else:
-        # assume a zip file
-        print('Extracting from Simplenote json in zip')
-        print('-' * 65)
-        arch = ZipFile(filename, 'r')
-        f = arch.open('source/notes.json')
-        json_bytes = f.read()
-        f.close()
-        notes_dict = json.loads(json_bytes)
-    dict2txt(notes_dict, output_directory=filename+'_dir', use_first_line_as_filename=use_first_line_as_filename, use_git=use_git, save_index=save_index, save_index_include_trashed=save_index_include_trashed)
+    notes_dict = load_file(filename, validate=validate)
+    dict2txt(notes_dict, output_directory=filename+'_dir', use_first_line_as_filename=use_first_line_as_filename, use_git=use_git, save_index=save_index, save_index_include_trashed=save_index_include_trashed, index_format=index_format)
 
 
     return 0
@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Reconstruct git history of notes from a series of Simplenote exports/backups
+# Also see related scripts simplenote_export2txt.py and import_files_to_git.py
+# Copyright (C) 2024 Chris Clark - clach04
+"""Generate a git fast-import stream from an ordered series of exports (oldest first)
+
+Each note change (new note, edited note, renamed file, deleted note) seen
+between backups becomes a commit at the note lastModified time, so the real
+edit history across backups is kept. Only the note ids/content hashes are
+compared between backups, unchanged notes cost a dict lookup.
+
+  * commits are in time order (not backup or file order)
+  * identical content is only written once to the stream
+  * deletions (and renames caused by other notes, when using first line filenames)
+    are timed at the newest lastModified in that backup
+  * no commit is earlier than the newest commit from the previous backup (or
+    an earlier commit for the same note), so later backups always win
+  * a path is only deleted by the note that currently owns it, so a note
+    moving away from a path does not remove another note that took the path
+
+Usage:
+
+    python simplenote_git_history.py history.fi backup_2023.zip backup_2024.zip ...
+    git init notes_repo
+    cd notes_repo
+    git fast-import < ../history.fi
+    git checkout master
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+import sanity_check_export
+import simplenote_common
+import simplenote_export2txt
+import simplenote_ordering
+
+
+ADD = 'ADDED'
+MODIFY = 'MODIFIED'
+RENAME = 'RENAMED'
+DELETE = 'DELETED'
+
+
+class HistoryBuilder(object):
+    """Feed exports (oldest first) with add_snapshot(), then write_commits()
+    Blobs are written to output_file as soon as they are seen, commits (without content) are held until all snapshots are processed,
+    sorted with bounded memory (see simplenote_ordering)
+    """
+    def __init__(self, output_file, use_first_line_as_filename=False, file_extension='txt', author='Some User <email@address.domain>', branch='refs/heads/master'):
+        self.output_file = output_file
+        self.use_first_line_as_filename = use_first_line_as_filename
+        self.file_extension = file_extension
+        self.author = author
+        self.branch = branch
+        self.state = {}  # note id -> (content hash, path) as of the last snapshot
+        self.blob_marks = {}  # content hash -> fast-import mark number
+        self.events = simplenote_ordering.ExternalSorter()  # (timestamp, sequence, note id, operation, path, blob mark, old path, metadata json)
+        self.snapshot_count = 0
+        self.previous_time = 0  # newest event time up to the previous snapshot, events are never earlier
+        self.note_times = {}  # note id -> time of last event for that note
+
+    def write_blob(self, content_bytes):
+        mark = len(self.blob_marks) + 1
+        self.output_file.write(b'blob\nmark :' + str(mark).encode('us-ascii') + b'\ndata ' + str(len(content_bytes)).encode('us-ascii') + b'\n')
+        self.output_file.write(content_bytes)
+        self.output_file.write(b'\n')
+        return mark
+
+    def add_snapshot(self, notes_dict):
+        """Compare notes_dict with previous snapshot, record events for the differences
+        Returns dict of operation -> count
+        """
+        self.snapshot_count += 1
+        counts = {ADD: 0, MODIFY: 0, RENAME: 0, DELETE: 0}
+        timestamps = [simplenote_common.iso_like2secs(note_entry['lastModified']) for section in ('activeNotes', 'trashedNotes') for note_entry in notes_dict[section]]
+        snapshot_time = max(timestamps or [0])
+
+        if self.use_first_line_as_filename:
+            dupe_dict = sanity_check_export.find_duplicate_filenames_dict(notes_dict, generate_file_name=sanity_check_export.safe_filename)
+        else:
+            dupe_dict = {}  # not needed, filename is id
+        new_state = {}
+        newest_time = self.previous_time
+        for note_entry in notes_dict['activeNotes']:
+            note_id = note_entry['id']
+            note_entry = dict(note_entry)
+            note_entry['content'] = note_entry['content'].replace('\r', '')  # same newline handling as simplenote_export2txt.dict2txt()
+            content_bytes = note_entry['content'].encode('utf-8')
+            content_hash = hashlib.sha1(content_bytes).hexdigest()
+            path, safe_filename = simplenote_export2txt.note_to_filename(note_entry, dupe_dict, use_first_line_as_filename=self.use_first_line_as_filename, file_extension=self.file_extension)
+            new_state[note_id] = (content_hash, path)
+
+            previous = self.state.get(note_id)
+            if previous == (content_hash, path):
+                continue  # unchanged, the common case
+            if previous is None:
+                operation = ADD
+                old_path = None
+                timestamp = simplenote_common.iso_like2secs(note_entry['lastModified'])
+            elif previous[0] != content_hash:
+                operation = MODIFY
+                old_path = previous[1]
+                timestamp = simplenote_common.iso_like2secs(note_entry['lastModified'])
+            else:
+                operation = RENAME
+                old_path = previous[1]
+                timestamp = snapshot_time
+            if old_path == path:
+                old_path = None
+            timestamp = max(timestamp, self.previous_time, self.note_times.get(note_id, 0))  # clocks/backups can disagree, never commit before an earlier change
+            self.note_times[note_id] = timestamp
+            newest_time = max(newest_time, timestamp)
+            mark = self.blob_marks.get(content_hash)
+            if mark is None:
+                mark = self.blob_marks[content_hash] = self.write_blob(content_bytes)
+            del note_entry['content']
+            note_entry['filename'] = safe_filename
+            metadata = json.dumps(note_entry, indent=1, sort_keys=True)
+            self.events.add((timestamp, len(self.events), note_id, operation, path, mark, old_path, metadata))
+            counts[operation] += 1
+
+        trashed_ids = dict((note_entry['id'], note_entry) for note_entry in notes_dict['trashedNotes'])
+        for note_id in self.state:
+            if note_id in new_state:
+                continue
+            timestamp = snapshot_time
+            note_entry = trashed_ids.get(note_id)
+            if note_entry is not None:
+                timestamp = simplenote_common.iso_like2secs(note_entry['lastModified'])  # time it was trashed
+            timestamp = max(timestamp, self.previous_time, self.note_times.pop(note_id, 0))
+            newest_time = max(newest_time, timestamp)
+            self.events.add((timestamp, len(self.events), note_id, DELETE, self.state[note_id][1], None, None, ''))
+            counts[DELETE] += 1
+
+        self.state = new_state
+        self.previous_time = newest_time
+        return counts
+
+    def write_commits(self):
+        """Write commits for all events, in time order. Returns number of commits
+        """
+        output_file = self.output_file
+        owners = {}  # path -> note id, with first line filenames a path can move between notes within a snapshot
+        for timestamp, _sequence, note_id, operation, path, mark, old_path, metadata in self.events:
+            commit_message = ('%s note id=%s\n\n%s\n' % (operation, note_id, metadata)).encode('utf-8')
+            identity = ('%s %d +0000' % (self.author, timestamp)).encode('utf-8')
+            output_file.write(b'commit ' + self.branch.encode('utf-8') + b'\n')
+            output_file.write(b'author ' + identity + b'\n')
+            output_file.write(b'committer ' + identity + b'\n')
+            output_file.write(b'data ' + str(len(commit_message)).encode('us-ascii') + b'\n')
+            output_file.write(commit_message)
+            if operation == DELETE:
+                old_path = path
+                path = None
+            if old_path and owners.get(old_path) == note_id:
+                del owners[old_path]
+                output_file.write(b'D ' + old_path.encode('utf-8') + b'\n')
+            if path:
+                owners[path] = note_id
+                output_file.write(b'M 100644 :' + str(mark).encode('us-ascii') + b' ' + path.encode('utf-8') + b'\n')
+            output_file.write(b'\n')
+        output_file.write(b'done\n')
+        return len(self.events)
+
+
+def export_tree(notes_dict, use_first_line_as_filename=False, file_extension='txt'):
+    """Returns dict of path -> sha1 hex of content for active notes, i.e. what the final git tree should contain
+    """
+    if use_first_line_as_filename:
+        dupe_dict = sanity_check_export.find_duplicate_filenames_dict(notes_dict, generate_file_name=sanity_check_export.safe_filename)
+    else:
+        dupe_dict = {}
+    tree = {}
+    for note_entry in notes_dict['activeNotes']:
+        note_entry = dict(note_entry)
+        note_entry['content'] = note_entry['content'].replace('\r', '')
+        path, _safe_filename = simplenote_export2txt.note_to_filename(note_entry, dupe_dict, use_first_line_as_filename=use_first_line_as_filename, file_extension=file_extension)
+        tree[path] = hashlib.sha1(note_entry['content'].encode('utf-8')).hexdigest()
+    return tree
+
+def replay_stream(f):
+    """Apply a fast-import stream written by HistoryBuilder, without git
+    Returns dict of path -> sha1 hex of content for the final tree (only blob hashes are kept in memory, not content)
+    """
+    blob_hashes = {}  # mark -> sha1 hex
+    tree = {}
+    while True:
+        line = f.readline()
+        if not line or line == b'done\n':
+            break
+        if line == b'blob\n':
+            mark = f.readline()[len(b'mark :'):-1]
+            length = int(f.readline()[len(b'data '):])
+            blob_hashes[mark] = hashlib.sha1(f.read(length)).hexdigest()
+        elif line.startswith(b'commit '):
+            while not line.startswith(b'data '):
+                line = f.readline()  # author and committer
+            f.read(int(line[len(b'data '):]))  # commit message
+            while True:
+                line = f.readline()
+                if line in (b'\n', b''):
+                    break
+                if line.startswith(b'D '):
+                    tree.pop(line[2:-1].decode('utf-8'), None)
+                elif line.startswith(b'M '):
+                    _command, _mode, data_ref, path = line[:-1].split(b' ', 3)
+                    tree[path.decode('utf-8')] = blob_hashes[data_ref[1:]]
+    return tree
+
+def compare_trees(expected, actual):
+    """Returns list of (path, problem), empty if the same
+    """
+    problems = []
+    for path in sorted(set(expected).union(actual)):
+        if path not in actual:
+            problems.append((path, 'missing'))
+        elif path not in expected:
+            problems.append((path, 'not in export'))
+        elif expected[path] != actual[path]:
+            problems.append((path, 'content differs'))
+    return problems
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    # FIXME proper command line argument processing needed
+    if len(argv) < 3:
+        print('Usage: %s OUTPUT_FILENAME.fi EXPORT_FILENAME [EXPORT_FILENAME...]' % argv[0])
+        print('export filenames in date order, oldest first')
+        return 1
+    output_filename = argv[1]
+    filenames = argv[2:]
+    use_first_line_as_filename = simplenote_common.force_bool(os.environ.get('SIMPLENOTE_READABLE_FILENAMES', False))
+    author = os.environ.get('SIMPLENOTE_GIT_AUTHOR', 'Some User <email@address.domain>')
+
+    f = open(output_filename, 'wb')
+    builder = HistoryBuilder(f, use_first_line_as_filename=use_first_line_as_filename, author=author)
+    for filename in filenames:
+        notes_dict = simplenote_common.load_file(filename)
+        counts = builder.add_snapshot(notes_dict)
+        print('%s: %s' % (filename, ', '.join('%d %s' % (counts[operation], operation.lower()) for operation in (ADD, MODIFY, RENAME, DELETE))))
+    commit_count = builder.write_commits()
+    f.close()
+    print('%d commits, %d unique note versions written to %r' % (commit_count, len(builder.blob_marks), output_filename))
+
+    # check final tree from the stream matches the last export
+    f = open(output_filename, 'rb')
+    problems = compare_trees(export_tree(notes_dict, use_first_line_as_filename=use_first_line_as_filename), replay_stream(f))
+    f.close()
+    for path, problem in problems:
+        print('%s %r' % (problem, path))
+    if problems:
+        print('ERROR final tree does not match %r' % filenames[-1])
+        return 1
+    print('import with: git init REPO_DIR && cd REPO_DIR && git fast-import < %s && git checkout master' % os.path.abspath(output_filename))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
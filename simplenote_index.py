@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Compact random access (binary) alternative to simplenote_index.json
+# Also see related script simplenote_export2txt.py
+# Copyright (C) 2024 Chris Clark - clach04
+"""Binary index format, single note metadata lookups are O(log n) without loading the whole index
+
+File layout, all integers big-endian:
+
+    header      - magic, version, note count, offsets/lengths of the sections below
+    records     - one fixed size record per active note, sorted on (utf-8) id;
+                  id offset/length into id table and metadata offset/length
+    id table    - utf-8 ids, concatenated
+    metadata    - compact json per note (same content as simplenote_index.json activeNotes entries)
+    trashed     - zlib compressed json list of trashed notes (including content), only read on demand
+
+Converters to and from the json form (simplenote_index.json) are included.
+"""
+
+import json
+import mmap
+import struct
+import sys
+import zlib
+
+
+MAGIC = b'SNINDEX\x00'
+VERSION = 1
+HEADER = struct.Struct('>8sII6Q')  # magic, version, note count, records offset, id table offset, metadata offset, trashed offset, trashed length, reserved
+RECORD = struct.Struct('>IHQI')  # id offset (in id table), id length, metadata offset (absolute), metadata length
+
+BINARY_INDEX_FILENAME = 'simplenote_index.snidx'
+JSON_INDEX_FILENAME = 'simplenote_index.json'
+NDJSON_INDEX_FILENAME = 'simplenote_index.ndjson'
+
+
+def normalize_trashed_notes(trashed_notes):
+    """Older simplenote_export2txt versions wrote trashedNotes as a list containing a single list
+    """
+    if len(trashed_notes) == 1 and isinstance(trashed_notes[0], list):
+        return trashed_notes[0]
+    return trashed_notes
+
+def write_binary_index(index_dict, filename):
+    """index_dict in the same format as simplenote_index.json;
+        {'activeNotes': {id: metadata, ...}, 'trashedNotes': [note, ...]}
+    trashedNotes is optional
+    """
+    active_notes = index_dict['activeNotes']
+    encoded = []
+    for note_id, note_entry in active_notes.items():
+        encoded.append((note_id.encode('utf-8'), json.dumps(note_entry, sort_keys=True, separators=(',', ':')).encode('utf-8')))
+    encoded.sort()
+
+    records_offset = HEADER.size
+    id_table_offset = records_offset + RECORD.size * len(encoded)
+    id_table_length = sum(len(note_id) for note_id, _dummy in encoded)
+    metadata_offset = id_table_offset + id_table_length
+
+    records = []
+    id_table = []
+    metadata = []
+    id_position = 0
+    metadata_position = metadata_offset
+    for note_id, note_metadata in encoded:
+        records.append(RECORD.pack(id_position, len(note_id), metadata_position, len(note_metadata)))
+        id_table.append(note_id)
+        metadata.append(note_metadata)
+        id_position += len(note_id)
+        metadata_position += len(note_metadata)
+
+    trashed_offset = metadata_position
+    trashed_notes = index_dict.get('trashedNotes')
+    if trashed_notes is None:
+        trashed = b''
+    else:
+        trashed = zlib.compress(json.dumps(normalize_trashed_notes(trashed_notes), separators=(',', ':')).encode('utf-8'))
+
+    f = open(filename, 'wb')
+    f.write(HEADER.pack(MAGIC, VERSION, len(encoded), records_offset, id_table_offset, metadata_offset, trashed_offset, len(trashed), 0))
+    f.write(b''.join(records))
+    f.write(b''.join(id_table))
+    f.write(b''.join(metadata))
+    f.write(trashed)
+    f.close()
+
+
+class BinaryIndex(object):
+    """Read only access to a binary index file, uses mmap so only the pages touched are read
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self.f = open(filename, 'rb')
+        self.data = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.note_count, self.records_offset, self.id_table_offset, self.metadata_offset, self.trashed_offset, self.trashed_length, _reserved = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            if magic != MAGIC:
+                raise ValueError('not a Simplenote binary index %r' % filename)
+            raise ValueError('unsupported binary index version %r in %r' % (version, filename))
+
+    def close(self):
+        self.data.close()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.note_count
+
+    def _record(self, position):
+        return RECORD.unpack_from(self.data, self.records_offset + position * RECORD.size)
+
+    def _id_bytes(self, position):
+        id_offset, id_length, _dummy, _dummy = self._record(position)
+        start = self.id_table_offset + id_offset
+        return self.data[start:start + id_length]
+
+    def _find(self, note_id):
+        """Returns record position for note_id or -1, binary search
+        """
+        note_id = note_id.encode('utf-8')
+        low, high = 0, self.note_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._id_bytes(mid) < note_id:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.note_count and self._id_bytes(low) == note_id:
+            return low
+        return -1
+
+    def __contains__(self, note_id):
+        return self._find(note_id) != -1
+
+    def get(self, note_id, default=None):
+        """Returns metadata dict for active note note_id
+        """
+        position = self._find(note_id)
+        if position == -1:
+            return default
+        _dummy, _dummy, metadata_offset, metadata_length = self._record(position)
+        return json.loads(self.data[metadata_offset:metadata_offset + metadata_length].decode('utf-8'))
+
+    def __getitem__(self, note_id):
+        result = self.get(note_id)
+        if result is None:
+            raise KeyError(note_id)
+        return result
+
+    def ids(self):
+        """Generator of active note ids, in sorted order
+        """
+        for position in range(self.note_count):
+            yield self._id_bytes(position).decode('utf-8')
+
+    def has_trashed_notes(self):
+        return self.trashed_length != 0
+
+    def trashed_notes(self):
+        """Returns list of trashed notes (with content), decompressed on demand
+        """
+        if not self.trashed_length:
+            return []
+        return json.loads(zlib.decompress(self.data[self.trashed_offset:self.trashed_offset + self.trashed_length]).decode('utf-8'))
+
+    def to_dict(self):
+        """Returns dict in the same format as simplenote_index.json
+        """
+        result = {'activeNotes': {}}
+        for position in range(self.note_count):
+            _dummy, _dummy, metadata_offset, metadata_length = self._record(position)
+            note_id = self._id_bytes(position).decode('utf-8')
+            result['activeNotes'][note_id] = json.loads(self.data[metadata_offset:metadata_offset + metadata_length].decode('utf-8'))
+        if self.has_trashed_notes():
+            result['trashedNotes'] = self.trashed_notes()
+        return result
+
+
+def json_index_to_binary(json_filename, binary_filename):
+    f = open(json_filename, 'rb')
+    json_bytes = f.read()
+    f.close()
+    write_binary_index(json.loads(json_bytes), binary_filename)
+
+def binary_index_to_json(binary_filename, json_filename):
+    index = BinaryIndex(binary_filename)
+    try:
+        index_dict = index.to_dict()
+    finally:
+        index.close()
+    f = open(json_filename, 'wb')
+    f.write(json.dumps(index_dict, sort_keys=True, indent=1).encode('utf-8'))  # NOTE matches simplenote_export2txt
+    f.close()
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    usage = '''Usage:
+    %s to_binary simplenote_index.json simplenote_index.snidx
+    %s to_json simplenote_index.snidx simplenote_index.json
+    %s get simplenote_index.snidx NOTE_ID''' % ((argv[0],) * 3)
+    # FIXME proper command line argument processing needed
+    try:
+        command, in_filename, out_filename = argv[1:4]
+    except ValueError:
+        print(usage)
+        return 1
+
+    if command == 'to_binary':
+        json_index_to_binary(in_filename, out_filename)
+    elif command == 'to_json':
+        binary_index_to_json(in_filename, out_filename)
+    elif command == 'get':
+        index = BinaryIndex(in_filename)
+        note_entry = index.get(out_filename)
+        index.close()
+        if note_entry is None:
+            print('%r not found' % out_filename)
+            return 1
+        print(json.dumps(note_entry, sort_keys=True, indent=1))
+    else:
+        print(usage)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,22 +5,19 @@
 # Convert json export to (id sorted) YAML for easier diffing
 # Copyright (C) 2023 Chris Clark - clach04
 
-import json
-import os
-import string
 import sys
-from zipfile import ZipFile, ZIP_DEFLATED
 
-import yaml  # pip install pyyaml==3.12  (for python2 and 3 support - TODO requirements.txt)
+from simplenote_common import load_file
 
 
 def dict2yaml(notes_dict, filename='debug.yaml'):
+    import yaml  # pip install pyyaml==3.12  (for python2 and 3 support - TODO requirements.txt) - only imported when needed, start up time
     notes = {}
     for note_entry in notes_dict['activeNotes']:
         note_entry['content'] = note_entry['content'].replace('\r', '')  # I don't use a Mac, I've no idea if this will break Mac
         notes[note_entry['id']] = note_entry
     f = open(filename, 'wb')
-    yaml_str = yaml.safe_dump(notes, default_flow_style=False)  # keys will be sorted
+    yaml_str = yaml.safe_dump(notes, default_flow_style=False, encoding='utf-8')  # keys will be sorted, bytes for both Python 2 and 3
     f.write(yaml_str)
     f.close()
 
@@ -39,22 +36,7 @@ def main(argv=None):
     filename = ''
     filename = argv[1]
 
-    if filename.lower().endswith('.json'):
-        print('Checking json ONLY')
-        print('-' * 65)
-        f = open(filename, 'rb')
-        json_bytes = f.read()
-        f.close()
-        notes_dict = json.loads(json_bytes)
-    else:
-        # assume a zip file
-        print('Checking json in zip')
-        print('-' * 65)
-        arch = ZipFile(filename, 'r')
-        f = arch.open('source/notes.json')
-        json_bytes = f.read()
-        f.close()
-        notes_dict = json.loads(json_bytes)
+    notes_dict = load_file(filename)
     dict2yaml(notes_dict, filename=filename+'.yaml')
 
 
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Convert Simplenote exports to/from NDJSON (one note per line), and process large NDJSON files in parallel
+# Copyright (C) 2024 Chris Clark - clach04
+"""NDJSON is one note per line, same keys as a note in an export with an
+extra "trashed": true for notes from trashedNotes. Unlike a single json
+document it can be appended to, split, and read a line (note) at a time.
+
+Conversion is by output filename extension; .ndjson, .ndjson.gz (gzip), or .json
+
+    python simplenote_ndjson.py note.zip notes.ndjson
+    python simplenote_ndjson.py notes.ndjson.gz notes.json
+
+Uncompressed NDJSON files can be split into byte ranges that start and end
+on line boundaries (see ndjson_chunks()), each range can then be read
+independently (see iter_ndjson_range()), e.g. by worker processes:
+
+    python simplenote_ndjson.py notes.ndjson count
+"""
+
+import json
+import os
+import sys
+
+import simplenote_common
+
+
+def ndjson_chunks(filename, chunk_count):
+    """Returns list of (start, end) byte offsets, at most chunk_count, covering the whole file
+    Each range starts at the beginning of a line and ends after a newline (or at end of file)
+    Only for uncompressed files, gzip does not support random access
+    """
+    if filename.lower().endswith('.gz'):
+        raise ValueError('compressed NDJSON can not be split, %r' % filename)
+    file_size = os.path.getsize(filename)
+    chunk_count = max(1, min(chunk_count, file_size))
+    boundaries = [0]
+    f = open(filename, 'rb')
+    try:
+        for chunk_number in range(1, chunk_count):
+            offset = file_size * chunk_number // chunk_count
+            if offset <= boundaries[-1]:
+                continue  # previous line was longer than a chunk
+            f.seek(offset - 1)
+            f.readline()  # skip to start of next line, unless offset - 1 is a newline (i.e. offset already is a line start)
+            offset = f.tell()
+            if offset >= file_size:
+                break
+            if offset > boundaries[-1]:
+                boundaries.append(offset)
+    finally:
+        f.close()
+    boundaries.append(file_size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+def iter_ndjson_range(filename, start=0, end=None):
+    """Generator of (section, note_entry) for lines starting in byte range start (inclusive) to end (exclusive)
+    """
+    f = simplenote_common.open_ndjson(filename)
+    try:
+        if start:
+            f.seek(start)
+        position = start
+        for line in f:
+            if end is not None and position >= end:
+                break
+            position += len(line)
+            section, note_entry = simplenote_common.ndjson_line_to_note(line)
+            if section:
+                yield section, note_entry
+    finally:
+        f.close()
+
+def _process_range(job):
+    """Worker process entry point, job is (function, filename, start, end)
+    """
+    function, filename, start, end = job
+    return function(iter_ndjson_range(filename, start, end))
+
+def map_ndjson_chunks(filename, function, workers=None, chunk_count=None):
+    """Call function(iterator of (section, note_entry)) for byte ranges of filename in worker processes
+    function must be a module level function (pickled to send to worker processes)
+    Returns list of results, in file order. workers defaults to the number of CPUs, chunk_count defaults to workers
+    """
+    import multiprocessing  # only import when needed, start up time
+    workers = workers or multiprocessing.cpu_count()
+    chunks = ndjson_chunks(filename, chunk_count or workers)
+    jobs = [(function, filename, start, end) for start, end in chunks]
+    if workers == 1 or len(jobs) == 1:
+        return [_process_range(job) for job in jobs]  # no process start up cost
+    pool = multiprocessing.Pool(min(workers, len(jobs)))
+    try:
+        return pool.map(_process_range, jobs)
+    finally:
+        pool.close()
+        pool.join()
+
+def count_notes(notes_iterator):
+    """Returns dict of section -> note count and content characters, for use with map_ndjson_chunks()
+    """
+    result = {
+        'activeNotes': [0, 0],
+        'trashedNotes': [0, 0],
+    }
+    for section, note_entry in notes_iterator:
+        counts = result[section]
+        counts[0] += 1
+        counts[1] += len(note_entry['content'])
+    return result
+
+
+def convert(filename, output_filename):
+    """Convert between export formats (zip, json, NDJSON) based on filename extensions
+    """
+    notes_dict = simplenote_common.load_file(filename)
+    if simplenote_common.is_ndjson_filename(output_filename):
+        simplenote_common.dump_ndjson(notes_dict, output_filename)
+    else:
+        notes_dict.setdefault('trashedNotes', [])  # NOTE required, web interface will silently crash if missing (error in debug console, but nothing in UI).
+        f = open(output_filename, 'wb')
+        f.write(json.dumps(notes_dict, indent=4).encode('utf-8'))
+        f.close()
+    return notes_dict
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    # FIXME proper command line argument processing needed
+    try:
+        filename = argv[1]
+        output_filename = argv[2]
+    except IndexError:
+        print('Usage: %s EXPORT_FILENAME OUTPUT_FILENAME|count' % argv[0])
+        return 1
+
+    if output_filename == 'count':
+        totals = count_notes([])
+        for result in map_ndjson_chunks(filename, count_notes):
+            for section, counts in result.items():
+                totals[section][0] += counts[0]
+                totals[section][1] += counts[1]
+        for section in ('activeNotes', 'trashedNotes'):
+            print('%s: %d notes, %d characters' % (section, totals[section][0], totals[section][1]))
+        return 0
+
+    notes_dict = convert(filename, output_filename)
+    print('%d active and %d trashed notes written to %r' % (len(notes_dict['activeNotes']), len(notes_dict['trashedNotes']), output_filename))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
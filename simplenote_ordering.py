@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Sort (timestamp, name, operation) records into time order with bounded memory, for git commit/script generation
+# Also see import_files_to_git.py, import_dirs_to_git.py, simplenote_export2txt.py, and simplenote_git_history.py
+# Copyright (C) 2024 Chris Clark - clach04
+"""External merge sort. Records (tuples, or anything picklable and comparable)
+are buffered in memory, each time run_size records are buffered they are
+sorted and written (pickled) to a temporary file. Reading merges all runs
+(and the remaining buffer) with heapq.merge() and yields one record at a
+time, so memory use is about run_size records plus one read batch per run.
+
+    sorter = ExternalSorter()
+    for timestamp, filename, operation in ...:
+        sorter.add((timestamp, filename, operation))
+    for record in sorter:
+        ...  # time order, first record available as soon as the merge starts
+    sorter.close()  # removes temporary files, also done when iteration completes
+
+Records with equal timestamps are sorted by the rest of the tuple, add a
+sequence number as the second item to keep insertion order for ties.
+"""
+
+import heapq
+import os
+import pickle
+
+
+DEFAULT_RUN_SIZE = 100000  # records held in memory before writing a sorted run
+BATCH_SIZE = 1000  # records per pickle in a run file, i.e. per read when merging
+
+
+def iter_run(filename):
+    """Generator of records from a run file written by ExternalSorter
+    """
+    f = open(filename, 'rb')
+    try:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                break
+            for record in batch:
+                yield record
+    finally:
+        f.close()
+
+
+class ExternalSorter(object):
+    def __init__(self, run_size=DEFAULT_RUN_SIZE, temp_directory=None):
+        self.run_size = run_size
+        self.temp_directory = temp_directory
+        self.buffer = []
+        self.run_filenames = []
+        self.count = 0
+
+    def add(self, record):
+        self.buffer.append(record)
+        self.count += 1
+        if len(self.buffer) >= self.run_size:
+            self.write_run()
+
+    def extend(self, records):
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return self.count
+
+    def write_run(self):
+        """Sort buffered records and write to a new run file
+        """
+        import tempfile  # only import when needed (small inputs never write a run), start up time
+        self.buffer.sort()
+        fd, filename = tempfile.mkstemp(prefix='sorted_run_', suffix='.pickle', dir=self.temp_directory)
+        self.run_filenames.append(filename)
+        f = os.fdopen(fd, 'wb')
+        try:
+            buffer = self.buffer
+            for position in range(0, len(buffer), BATCH_SIZE):
+                pickle.dump(buffer[position:position + BATCH_SIZE], f, pickle.HIGHEST_PROTOCOL)
+        finally:
+            f.close()
+        self.buffer = []
+
+    def __iter__(self):
+        """Generator of all records in sorted order, temporary files are removed when done
+        NOTE records can not be added while iterating
+        """
+        self.buffer.sort()
+        if not self.run_filenames:
+            # everything fit in memory, no merge needed
+            for record in self.buffer:
+                yield record
+            return
+        try:
+            for record in heapq.merge(self.buffer, *[iter_run(filename) for filename in self.run_filenames]):
+                yield record
+        finally:
+            self.close()
+
+    def close(self):
+        for filename in self.run_filenames:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass  # already removed
+        self.run_filenames = []
+        self.buffer = []
+
+
+def sorted_records(records, run_size=DEFAULT_RUN_SIZE, temp_directory=None):
+    """Like sorted(records) but with bounded memory, returns a generator
+    """
+    sorter = ExternalSorter(run_size=run_size, temp_directory=temp_directory)
+    sorter.extend(records)
+    return iter(sorter)
+
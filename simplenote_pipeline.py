@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Load a Simplenote export once and feed every note to multiple outputs (sinks)
+# Copyright (C) 2024 Chris Clark - clach04
+"""Single load, multiple output pipeline
+
+Instead of running sanity_check_export, simplenote_export2txt and
+simplenote_json2yaml separately (each parsing the same export), load once and
+fan each note out to sinks:
+
+  * check - sanity_check_export checks (missing newlines, duplicate titles)
+  * text - text files, same as simplenote_export2txt.dict2txt()
+  * index - simplenote_index.json (or binary index)
+  * yaml - same as simplenote_json2yaml.dict2yaml(), requires pyyaml
+  * git - git repo with one commit per note, same as dict2txt(use_git=True), requires Dulwich
+
+Each sink runs in its own thread and walks the (already loaded) notes itself,
+so a slow sink (git, yaml) does not hold up the fast ones. Sinks receive the
+same note dictionaries, they must NOT modify them (copy first). Combined timing
+report at the end.
+"""
+
+import copy
+import json
+import os
+import sys
+import threading
+import time
+
+import sanity_check_export
+import simplenote_common
+import simplenote_export2txt
+import simplenote_ordering
+
+
+ACTIVE = 'activeNotes'
+TRASHED = 'trashedNotes'
+
+
+class Sink(object):
+    """Base class for pipeline outputs, override the methods needed
+    """
+    name = 'sink'
+
+    def start(self, notes_dict, dupe_dict):
+        """Called once before any notes, dupe_dict is from sanity_check_export.find_duplicate_filenames_dict() using safe_filename()
+        """
+        pass
+
+    def note(self, section, note_entry):
+        """Called for each note, section is ACTIVE or TRASHED
+        """
+        pass
+
+    def finish(self):
+        pass
+
+
+class CheckSink(Sink):
+    name = 'check'
+
+    def start(self, notes_dict, dupe_dict):
+        self.validator = sanity_check_export.NotesValidator()
+        self.validator.top_level(notes_dict)
+        self.filenames = {}
+
+    def note(self, section, note_entry):
+        self.validator.note(section, note_entry)
+        if section == ACTIVE:
+            sanity_check_export.check_note_entry(note_entry, self.filenames)
+
+    def finish(self):
+        sanity_check_export.report_on_violations(self.validator.violations)
+        print('*' * 34)
+        sanity_check_export.report_on_dupes(self.filenames)
+
+
+class TextSink(Sink):
+    name = 'text'
+
+    def __init__(self, output_directory, use_first_line_as_filename=False, file_extension='txt'):
+        self.output_directory = output_directory
+        self.use_first_line_as_filename = use_first_line_as_filename
+        self.file_extension = file_extension
+
+    def start(self, notes_dict, dupe_dict):
+        self.dupe_dict = dupe_dict
+        simplenote_common.safe_mkdir(self.output_directory)
+
+    def note(self, section, note_entry):
+        if section != ACTIVE:
+            return
+        note_entry = copy.copy(note_entry)
+        note_entry['content'] = note_entry['content'].replace('\r', '')  # same newline handling as simplenote_export2txt.dict2txt()
+        filename, _dummy = simplenote_export2txt.note_to_filename(note_entry, self.dupe_dict, use_first_line_as_filename=self.use_first_line_as_filename, file_extension=self.file_extension)
+        simplenote_export2txt.write_note_file(os.path.join(self.output_directory, filename), note_entry)
+
+
+class IndexSink(Sink):
+    name = 'index'
+
+    def __init__(self, output_directory, include_trashed=True, index_format='json', use_first_line_as_filename=False, file_extension='txt'):
+        self.output_directory = output_directory
+        self.include_trashed = include_trashed
+        self.index_format = index_format
+        self.use_first_line_as_filename = use_first_line_as_filename  # should match TextSink, the name on disk is recorded in the index
+        self.file_extension = file_extension
+
+    def start(self, notes_dict, dupe_dict):
+        self.dupe_dict = dupe_dict
+        self.new_index = {
+            ACTIVE: {},  # this will be the note metadata without the content (and additional "filename")
+        }
+        if self.include_trashed:
+            self.new_index[TRASHED] = []  # include trashed/deleted notes, including actual content
+
+    def note(self, section, note_entry):
+        if section == TRASHED:
+            if self.include_trashed:
+                self.new_index[TRASHED].append(note_entry)
+            return
+        note_entry = copy.copy(note_entry)
+        note_entry['content'] = note_entry['content'].replace('\r', '')
+        filename, safe_filename = simplenote_export2txt.note_to_filename(note_entry, self.dupe_dict, use_first_line_as_filename=self.use_first_line_as_filename, file_extension=self.file_extension)
+        self.new_index[ACTIVE][note_entry['id']] = simplenote_export2txt.note_to_index_entry(note_entry, safe_filename, filename=filename)
+
+    def finish(self):
+        simplenote_common.safe_mkdir(self.output_directory)
+        simplenote_export2txt.write_index_file(self.new_index, self.output_directory, index_format=self.index_format)
+
+
+class YamlSink(Sink):
+    name = 'yaml'
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.notes = []
+
+    def note(self, section, note_entry):
+        if section == ACTIVE:
+            self.notes.append(copy.copy(note_entry))  # dict2yaml() modifies content
+
+    def finish(self):
+        import simplenote_json2yaml  # only import when needed, pyyaml is optional
+        simplenote_json2yaml.dict2yaml({ACTIVE: self.notes}, filename=self.filename)
+
+
+class GitSink(Sink):
+    """Writes its own copy of the text files into a new git repo, one commit per note
+    Commits are in last modified order (not order in json), same as dict2txt(), so they are made in finish()
+    """
+    name = 'git'
+
+    def __init__(self, output_directory, use_first_line_as_filename=False, file_extension='txt', author=b"Some User <email@address.domain>"):
+        self.output_directory = output_directory
+        self.use_first_line_as_filename = use_first_line_as_filename
+        self.file_extension = file_extension
+        self.author = author
+
+    def start(self, notes_dict, dupe_dict):
+        dulwich = simplenote_export2txt.import_dulwich()
+        self.dupe_dict = dupe_dict
+        simplenote_common.safe_mkdir(self.output_directory)
+        self.repo = dulwich.repo.Repo.init(self.output_directory)  # create new git repo
+        self.commits = simplenote_ordering.ExternalSorter()  # (last modified, sequence, filename, commit message)
+
+    def note(self, section, note_entry):
+        if section != ACTIVE:
+            return
+        note_entry = copy.copy(note_entry)
+        note_entry['content'] = note_entry['content'].replace('\r', '')
+        filename, safe_filename = simplenote_export2txt.note_to_filename(note_entry, self.dupe_dict, use_first_line_as_filename=self.use_first_line_as_filename, file_extension=self.file_extension)
+        st_mtime = simplenote_export2txt.write_note_file(os.path.join(self.output_directory, filename), note_entry)
+        del note_entry['content']
+        note_entry['filename'] = safe_filename
+        commit_message = 'Note id=%s\n\n%s\n' % (note_entry['id'], json.dumps(note_entry, indent=1))  # NOTE matches dict2txt()
+        self.commits.add((st_mtime, len(self.commits), filename, commit_message))
+
+    def finish(self):
+        for st_mtime, _sequence, filename, commit_message in self.commits:
+            self.repo.stage([filename.encode('utf-8')])
+            self.repo.do_commit(commit_message.encode('utf-8'), author=self.author, commit_timestamp=st_mtime, commit_timezone=0)
+
+
+class SinkRunner(threading.Thread):
+    """Runs a single sink in a thread, over every note in notes_dict
+    """
+    def __init__(self, sink, notes_dict, dupe_dict):
+        threading.Thread.__init__(self, name='sink_%s' % sink.name)
+        self.daemon = True
+        self.sink = sink
+        self.notes_dict = notes_dict
+        self.dupe_dict = dupe_dict
+        self.busy_time = 0.0  # seconds spent in sink methods
+        self.wall_time = None  # seconds from pipeline start until sink finished
+        self.note_count = 0
+        self.error = None
+
+    def run(self):
+        start_time = time.time()
+        sink = self.sink
+        try:
+            sink.start(self.notes_dict, self.dupe_dict)
+        except Exception as info:
+            self.error = info
+        if self.error is None:
+            try:
+                for section in (ACTIVE, TRASHED):
+                    for note_entry in self.notes_dict[section]:
+                        sink.note(section, note_entry)
+                        self.note_count += 1
+            except Exception as info:
+                self.error = info
+        self.busy_time += time.time() - start_time
+        if self.error is None:
+            finish_start_time = time.time()
+            try:
+                sink.finish()
+            except Exception as info:
+                self.error = info
+            self.busy_time += time.time() - finish_start_time
+        self.wall_time = time.time() - start_time
+
+
+def run_pipeline(notes_dict, sinks):
+    """Feed every note in notes_dict (from simplenote_common.load_file()) to each sink
+    Each sink runs in its own thread at its own pace, notes are already in memory so there is no queue between threads
+    Returns dict of timings (seconds); 'prepare', 'total' and 'sinks' list of (name, busy, wall, note count, error)
+    """
+    start_time = time.time()
+    dupe_dict = sanity_check_export.find_duplicate_filenames_dict(notes_dict, generate_file_name=sanity_check_export.safe_filename)  # shared by text, index, and git sinks
+    prepare_time = time.time() - start_time
+
+    runners = [SinkRunner(sink, notes_dict, dupe_dict) for sink in sinks]
+    for runner in runners:
+        runner.start()
+    for runner in runners:
+        runner.join()
+
+    return {
+        'prepare': prepare_time,
+        'total': time.time() - start_time,
+        'sinks': [(runner.sink.name, runner.busy_time, runner.wall_time, runner.note_count, runner.error) for runner in runners],
+    }
+
+
+def report_on_timings(timings, load_time=None):
+    print('-' * 65)
+    print('Timing report (seconds)')
+    print('-' * 65)
+    if load_time is not None:
+        print('%-10s %10.3f' % ('load', load_time))
+    print('%-10s %10.3f' % ('prepare', timings['prepare']))
+    print('%-10s %10s %10s %10s' % ('sink', 'busy', 'wall', 'notes'))
+    for name, busy_time, wall_time, note_count, error in timings['sinks']:
+        print('%-10s %10.3f %10.3f %10d%s' % (name, busy_time, wall_time, note_count, error is not None and ' ERROR %r' % (error,) or ''))
+    print('%-10s %10.3f' % ('total', timings['total'] + (load_time or 0.0)))
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    print('Python %s on %s' % (sys.version, sys.platform))
+
+    # FIXME proper command line argument processing needed
+    filename = argv[1]
+    try:
+        sink_names = argv[2].split(',')
+    except IndexError:
+        sink_names = ['check', 'text', 'index']
+
+    use_first_line_as_filename = simplenote_common.force_bool(os.environ.get('SIMPLENOTE_READABLE_FILENAMES', False))
+    save_index_include_trashed = simplenote_common.force_bool(os.environ.get('SIMPLENOTE_SAVE_INDEX_TRASHED', True))  # default is to save everything
+    index_format = os.environ.get('SIMPLENOTE_INDEX_FORMAT', 'json')  # json, ndjson, or binary
+
+    sinks = []
+    for sink_name in sink_names:
+        if sink_name == 'check':
+            sinks.append(CheckSink())
+        elif sink_name == 'text':
+            sinks.append(TextSink(filename + '_dir', use_first_line_as_filename=use_first_line_as_filename))
+        elif sink_name == 'index':
+            sinks.append(IndexSink(filename + '_dir', include_trashed=save_index_include_trashed, index_format=index_format, use_first_line_as_filename=use_first_line_as_filename))
+        elif sink_name == 'yaml':
+            sinks.append(YamlSink(filename + '.yaml'))
+        elif sink_name == 'git':
+            sinks.append(GitSink(filename + '_git', use_first_line_as_filename=use_first_line_as_filename))
+        else:
+            print('unknown sink %r, expected comma separated list of: check,text,index,yaml,git' % sink_name)
+            return 1
+
+    load_start_time = time.time()
+    notes_dict = simplenote_common.load_file(filename)
+    load_time = time.time() - load_start_time
+    timings = run_pipeline(notes_dict, sinks)
+    report_on_timings(timings, load_time=load_time)
+
+    for _dummy, _dummy, _dummy, _dummy, error in timings['sinks']:
+        if error is not None:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Content addressed store for many Simplenote exports/backups
+# Also see related script simplenote_export2txt.py
+# Copyright (C) 2024 Chris Clark - clach04
+"""Store many Simplenote exports/backups, each unique note body is only stored once
+
+Layout of a store directory:
+
+    objects/ab/cdef...  - note content (with '\\r' removed, utf-8), named by sha1 hex of content, sharded on first 2 characters
+    manifests/NAME.json - one per snapshot, note id -> hash plus metadata (no content)
+
+Snapshots can be materialized as a text directory (same layout as simplenote_export2txt)
+using hardlinks to the objects, so no extra space is used. Objects are made
+read-only, do NOT edit materialized files in place (use copy=True if edits are planned).
+
+NOTE hardlinks share timestamps, the object mtime is the lastModified of the
+first note seen with that content.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import time
+
+import sanity_check_export
+import simplenote_common
+import simplenote_export2txt
+
+
+MANIFEST_EXTENSION = '.json'
+
+
+class SnapshotStore(object):
+    def __init__(self, store_directory):
+        self.store_directory = store_directory
+        self.objects_directory = os.path.join(store_directory, 'objects')
+        self.manifests_directory = os.path.join(store_directory, 'manifests')
+        simplenote_common.safe_mkdir(self.objects_directory)
+        simplenote_common.safe_mkdir(self.manifests_directory)
+
+    def object_path(self, content_hash):
+        return os.path.join(self.objects_directory, content_hash[:2], content_hash[2:])
+
+    def manifest_path(self, name):
+        return os.path.join(self.manifests_directory, name + MANIFEST_EXTENSION)
+
+    def put_content(self, content, mtime=None):
+        """Store content (string) if not already present, returns hash
+        """
+        content_bytes = content.encode('utf-8')
+        content_hash = hashlib.sha1(content_bytes).hexdigest()
+        filename = self.object_path(content_hash)
+        if os.path.exists(filename):
+            return content_hash
+        simplenote_common.safe_mkdir(os.path.dirname(filename))
+        tmp_filename = filename + '.tmp'
+        f = open(tmp_filename, 'wb')
+        f.write(content_bytes)
+        f.close()
+        if mtime is not None:
+            os.utime(tmp_filename, (time.time(), mtime))
+        os.chmod(tmp_filename, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)  # read-only, objects are shared by hardlinks
+        os.rename(tmp_filename, filename)  # atomic, readers never see partial objects
+        return content_hash
+
+    def get_content(self, content_hash):
+        f = open(self.object_path(content_hash), 'rb')
+        content_bytes = f.read()
+        f.close()
+        return content_bytes.decode('utf-8')
+
+    def add_snapshot(self, notes_dict, name, source=None):
+        """Store notes_dict (from simplenote_common.load_file()) as snapshot name
+        Returns tuple of (note count, new object count)
+        """
+        dupe_dict = sanity_check_export.find_duplicate_filenames_dict(notes_dict, generate_file_name=sanity_check_export.safe_filename)
+        manifest = {
+            'name': name,
+            'source': source,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()),
+            'activeNotes': {},
+            'trashedNotes': {},
+        }
+        new_object_count = 0
+        for section in ('activeNotes', 'trashedNotes'):
+            for note_entry in notes_dict[section]:
+                content = note_entry['content'].replace('\r', '')  # same newline handling as simplenote_export2txt.dict2txt()
+                content_hash = hashlib.sha1(content.encode('utf-8')).hexdigest()
+                if not os.path.exists(self.object_path(content_hash)):
+                    self.put_content(content, mtime=simplenote_common.iso_like2secs(note_entry['lastModified']))
+                    new_object_count += 1
+                manifest_entry = dict((key, value) for key, value in note_entry.items() if key != 'content')
+                manifest_entry['hash'] = content_hash
+                if section == 'activeNotes':
+                    _dummy, manifest_entry['filename'] = simplenote_export2txt.note_to_filename(dict(note_entry, content=content), dupe_dict)
+                manifest[section][note_entry['id']] = manifest_entry
+
+        filename = self.manifest_path(name)
+        tmp_filename = filename + '.tmp'
+        f = open(tmp_filename, 'wb')
+        f.write(json.dumps(manifest, sort_keys=True, separators=(',', ':')).encode('utf-8'))  # compact, manifests are not for humans
+        f.close()
+        os.rename(tmp_filename, filename)
+        return len(manifest['activeNotes']) + len(manifest['trashedNotes']), new_object_count
+
+    def list_snapshots(self):
+        """Returns sorted list of snapshot names, manifests are not read
+        """
+        result = []
+        for filename in os.listdir(self.manifests_directory):
+            if filename.endswith(MANIFEST_EXTENSION):
+                result.append(filename[:-len(MANIFEST_EXTENSION)])
+        result.sort()
+        return result
+
+    def load_manifest(self, name):
+        f = open(self.manifest_path(name), 'rb')
+        json_bytes = f.read()
+        f.close()
+        return json.loads(json_bytes)
+
+    def delete_snapshot(self, name):
+        """Remove manifest only, use garbage_collect() to free unused objects
+        """
+        os.remove(self.manifest_path(name))
+
+    def load_snapshot(self, name):
+        """Returns notes_dict in the same format as simplenote_common.load_file()
+        NOTE content has '\\r' removed
+        """
+        manifest = self.load_manifest(name)
+        notes_dict = {}
+        for section in ('activeNotes', 'trashedNotes'):
+            notes = []
+            for note_id in sorted(manifest[section]):
+                note_entry = manifest[section][note_id]
+                content_hash = note_entry.pop('hash')
+                note_entry.pop('filename', None)
+                note_entry['content'] = self.get_content(content_hash)
+                notes.append(note_entry)
+            notes_dict[section] = notes
+        return notes_dict
+
+    def materialize(self, name, output_directory, use_first_line_as_filename=False, file_extension='txt', save_index=True, copy=False, index_format='json'):
+        """Create text directory for snapshot, same layout as simplenote_export2txt.dict2txt()
+        Uses hardlinks unless copy is True (or hardlinks are not supported)
+        index_format, see simplenote_export2txt.write_index_file()
+        """
+        manifest = self.load_manifest(name)
+        simplenote_common.safe_mkdir(output_directory)
+        filenames = {}  # note id -> filename on disk
+        for note_id, note_entry in manifest['activeNotes'].items():
+            if use_first_line_as_filename:
+                filename = note_entry['filename']
+            else:
+                filename = note_id
+            if file_extension:
+                filename = filename + '.' + file_extension
+            filenames[note_id] = filename
+            filename_full = os.path.join(output_directory, filename)
+            if os.path.exists(filename_full):
+                os.remove(filename_full)
+            object_filename = self.object_path(note_entry['hash'])
+            if copy:
+                shutil.copyfile(object_filename, filename_full)
+                os.utime(filename_full, (time.time(), simplenote_common.iso_like2secs(note_entry['lastModified'])))
+            else:
+                try:
+                    os.link(object_filename, filename_full)
+                except (AttributeError, OSError):
+                    # no hardlink support (platform, filesystem, or cross device)
+                    shutil.copyfile(object_filename, filename_full)
+
+        if save_index:
+            new_index = {
+                'activeNotes': {},
+                'trashedNotes': [],
+            }
+            for note_id, note_entry in manifest['activeNotes'].items():
+                note_entry = dict(note_entry)
+                note_entry['content_sha1'] = note_entry.pop('hash')  # NOTE same hash as simplenote_export2txt.note_to_index_entry()
+                note_entry['path'] = filenames[note_id]
+                new_index['activeNotes'][note_id] = note_entry
+            for note_id in sorted(manifest['trashedNotes']):
+                note_entry = dict(manifest['trashedNotes'][note_id])
+                note_entry['content'] = self.get_content(note_entry.pop('hash'))
+                new_index['trashedNotes'].append(note_entry)
+            simplenote_export2txt.write_index_file(new_index, output_directory, index_format=index_format)
+
+    def garbage_collect(self):
+        """Remove objects not referenced by any snapshot, returns number of objects removed
+        """
+        in_use = set()
+        for name in self.list_snapshots():
+            manifest = self.load_manifest(name)
+            for section in ('activeNotes', 'trashedNotes'):
+                for note_entry in manifest[section].values():
+                    in_use.add(note_entry['hash'])
+        removed_count = 0
+        for shard in os.listdir(self.objects_directory):
+            shard_directory = os.path.join(self.objects_directory, shard)
+            for filename in os.listdir(shard_directory):
+                if shard + filename in in_use:
+                    continue
+                filename_full = os.path.join(shard_directory, filename)
+                os.chmod(filename_full, stat.S_IWUSR | stat.S_IRUSR)  # Windows will not remove read-only files
+                os.remove(filename_full)
+                removed_count += 1
+            if not os.listdir(shard_directory):
+                os.rmdir(shard_directory)
+        return removed_count
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    usage = '''Usage:
+    %s STORE_DIR add EXPORT_FILENAME [SNAPSHOT_NAME]
+    %s STORE_DIR list
+    %s STORE_DIR materialize SNAPSHOT_NAME OUTPUT_DIR
+    %s STORE_DIR delete SNAPSHOT_NAME
+    %s STORE_DIR gc''' % ((argv[0],) * 5)
+    # FIXME proper command line argument processing needed
+    try:
+        store_directory = argv[1]
+        command = argv[2]
+    except IndexError:
+        print(usage)
+        return 1
+
+    store = SnapshotStore(store_directory)
+    if command == 'add':
+        filename = argv[3]
+        try:
+            name = argv[4]
+        except IndexError:
+            name = os.path.basename(filename)
+        notes_dict = simplenote_common.load_file(filename)
+        note_count, new_object_count = store.add_snapshot(notes_dict, name, source=os.path.abspath(filename))
+        print('snapshot %r, %d notes, %d new objects stored' % (name, note_count, new_object_count))
+    elif command == 'list':
+        for name in store.list_snapshots():
+            print(name)
+    elif command == 'materialize':
+        use_first_line_as_filename = simplenote_common.force_bool(os.environ.get('SIMPLENOTE_READABLE_FILENAMES', False))
+        index_format = os.environ.get('SIMPLENOTE_INDEX_FORMAT', 'json')  # json, ndjson, or binary
+        store.materialize(argv[3], argv[4], use_first_line_as_filename=use_first_line_as_filename, index_format=index_format)
+    elif command == 'delete':
+        store.delete_snapshot(argv[3])
+    elif command == 'gc':
+        print('%d unused objects removed' % store.garbage_collect())
+    else:
+        print(usage)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
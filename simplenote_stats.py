@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Statistics for a Simplenote export, sizes, tags, dates, newlines, etc.
+# Copyright (C) 2024 Chris Clark - clach04
+"""Single pass statistics for active and trashed notes
+
+  * content size (characters) and lines per note; total, mean, percentiles, log2 histogram
+  * tag cardinality and most used tags
+  * notes created per month
+  * newline style; Windows (CRLF), Unix (LF), or no newline at all
+  * longest titles (first lines) that safe_filename() truncates
+  * pinned and markdown counts
+
+Per note values are kept in compact array.array columns, not lists of dicts.
+Writes json and prints a summary.
+"""
+
+import bisect
+import heapq
+import json
+import sys
+from array import array
+
+import sanity_check_export
+import simplenote_common
+
+
+MAX_FILENAME_LENGTH = 100  # default for sanity_check_export.safe_filename()
+unicode_isalnum = type(u'').isalnum  # str under Python 3, unicode under Python 2
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+def summarize_column(values):
+    """values is an array of ints, returns dict of summary statistics and log2 histogram
+    """
+    sorted_values = array(values.typecode, sorted(values))
+    histogram = []  # (upper bound (exclusive) of power of two bucket, count), bucket boundaries found with binary search not per value
+    if sorted_values:
+        lower_position = bisect.bisect_right(sorted_values, 0)
+        if lower_position:
+            histogram.append(('0', lower_position))
+        bucket = 1
+        while lower_position < len(sorted_values):
+            bucket = bucket << 1
+            upper_position = bisect.bisect_left(sorted_values, bucket, lower_position)
+            if upper_position > lower_position:
+                histogram.append(('<%d' % bucket, upper_position - lower_position))
+            lower_position = upper_position
+    total = sum(sorted_values)
+    return {
+        'count': len(sorted_values),
+        'total': total,
+        'mean': float(total) / len(sorted_values) if sorted_values else 0.0,
+        'min': sorted_values[0] if sorted_values else 0,
+        'p50': percentile(sorted_values, 0.50),
+        'p90': percentile(sorted_values, 0.90),
+        'p99': percentile(sorted_values, 0.99),
+        'max': sorted_values[-1] if sorted_values else 0,
+        'histogram_log2': histogram,
+    }
+
+
+class NoteStats(object):
+    """Accumulate statistics for notes with add(), one call per note. Then call summary()
+    """
+    def __init__(self, longest_titles_count=10, max_filename_length=MAX_FILENAME_LENGTH):
+        self.sizes = array('L')  # content length in characters, per note
+        self.lines = array('L')  # number of lines, per note
+        self.tag_counts = {}
+        self.notes_with_tags = 0
+        self.created_per_month = {}  # 'YYYY-MM' -> count
+        self.crlf_count = 0
+        self.lf_count = 0
+        self.no_newline_count = 0
+        self.pinned_count = 0
+        self.markdown_count = 0
+        self.truncated_title_count = 0
+        self.longest_titles = []  # heap of (length, id, title), longest_titles_count entries
+        self.longest_titles_count = longest_titles_count
+        self.max_filename_length = max_filename_length
+
+    def add(self, note_entry):
+        content = note_entry['content']
+        self.sizes.append(len(content))
+        newline_count = content.count('\n')
+        self.lines.append(newline_count + 1)
+        if newline_count:
+            if '\r\n' in content:
+                self.crlf_count += 1
+            else:
+                self.lf_count += 1
+        else:
+            self.no_newline_count += 1
+
+        tags = note_entry.get('tags')
+        if tags:
+            self.notes_with_tags += 1
+            tag_counts = self.tag_counts
+            for tag in tags:
+                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        month = note_entry.get('creationDate', '')[:7]  # "2022-06-27T01:39:12.602Z" -> "2022-06", no date parsing needed
+        self.created_per_month[month] = self.created_per_month.get(month, 0) + 1
+        if note_entry.get('pinned'):
+            self.pinned_count += 1
+        if note_entry.get('markdown'):
+            self.markdown_count += 1
+
+        end_of_line = content.find('\n')
+        if end_of_line == -1:
+            end_of_line = len(content)
+        if end_of_line > self.max_filename_length:
+            # only titles longer than the limit can be truncated, safe_filename() never makes names longer
+            first_line = content[:end_of_line].replace('\r', '')
+            # alphanumeric characters are always kept, so a count over the limit means truncated without the (slow) exact check
+            if sum(map(unicode_isalnum, first_line)) > self.max_filename_length or len(sanity_check_export.safe_filename(first_line, max_filename_length=None)) > self.max_filename_length:
+                self.truncated_title_count += 1
+                entry = (len(first_line), note_entry['id'], first_line)
+                if len(self.longest_titles) < self.longest_titles_count:
+                    heapq.heappush(self.longest_titles, entry)
+                else:
+                    heapq.heappushpop(self.longest_titles, entry)
+
+    def summary(self, top_tags_count=20):
+        tags = sorted(self.tag_counts.items(), key=lambda item: (-item[1], item[0]))
+        return {
+            'note_count': len(self.sizes),
+            'size_chars': summarize_column(self.sizes),
+            'lines': summarize_column(self.lines),
+            'tags': {
+                'cardinality': len(self.tag_counts),
+                'notes_with_tags': self.notes_with_tags,
+                'assignments': sum(self.tag_counts.values()),
+                'top': tags[:top_tags_count],
+            },
+            'created_per_month': sorted(self.created_per_month.items()),
+            'newlines': {
+                'crlf': self.crlf_count,
+                'lf': self.lf_count,
+                'none': self.no_newline_count,
+            },
+            'truncated_titles': {
+                'count': self.truncated_title_count,
+                'longest': [{'length': length, 'id': note_id, 'title': title} for length, note_id, title in sorted(self.longest_titles, reverse=True)],
+            },
+            'pinned': self.pinned_count,
+            'markdown': self.markdown_count,
+        }
+
+
+def notes_dict_stats(notes_dict):
+    """Returns dict of section name -> summary dict
+    """
+    result = {}
+    for section in ('activeNotes', 'trashedNotes'):
+        stats = NoteStats()
+        add = stats.add
+        for note_entry in notes_dict[section]:
+            add(note_entry)
+        result[section] = stats.summary()
+    return result
+
+
+def report_on_stats(stats_dict):
+    for section in ('activeNotes', 'trashedNotes'):
+        summary = stats_dict[section]
+        print('-' * 65)
+        print('%s: %d notes' % (section, summary['note_count']))
+        print('-' * 65)
+        if not summary['note_count']:
+            continue
+        for column in ('size_chars', 'lines'):
+            column_summary = summary[column]
+            print('%-10s total %d, mean %.1f, min %d, p50 %d, p90 %d, p99 %d, max %d' % (column, column_summary['total'], column_summary['mean'], column_summary['min'], column_summary['p50'], column_summary['p90'], column_summary['p99'], column_summary['max']))
+            print('           histogram: %s' % ', '.join('%s: %d' % (bucket, count) for bucket, count in column_summary['histogram_log2']))
+        newlines = summary['newlines']
+        note_count = float(summary['note_count'])
+        print('newlines   crlf %d (%.1f%%), lf %d (%.1f%%), none %d (%.1f%%)' % (newlines['crlf'], 100 * newlines['crlf'] / note_count, newlines['lf'], 100 * newlines['lf'] / note_count, newlines['none'], 100 * newlines['none'] / note_count))
+        print('pinned %d, markdown %d' % (summary['pinned'], summary['markdown']))
+        tags = summary['tags']
+        print('tags       %d distinct, %d notes with tags, %d assignments' % (tags['cardinality'], tags['notes_with_tags'], tags['assignments']))
+        if tags['top']:
+            print('           top: %s' % ', '.join('%s (%d)' % (tag, count) for tag, count in tags['top'][:10]))
+        months = summary['created_per_month']
+        if months:
+            print('created    %s to %s, busiest month %s (%d notes)' % (months[0][0], months[-1][0], max(months, key=lambda item: item[1])[0], max(months, key=lambda item: item[1])[1]))
+        truncated = summary['truncated_titles']
+        print('truncated titles %d' % truncated['count'])
+        for entry in truncated['longest']:
+            print('    %5d %s %r' % (entry['length'], entry['id'], entry['title'][:60] + '...'))
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    # FIXME proper command line argument processing needed
+    filename = argv[1]
+    try:
+        output_filename = argv[2]
+    except IndexError:
+        output_filename = filename + '.stats.json'
+
+    notes_dict = simplenote_common.load_file(filename)
+    stats_dict = notes_dict_stats(notes_dict)
+    f = open(output_filename, 'wb')
+    f.write(json.dumps(stats_dict, indent=1, sort_keys=True).encode('utf-8'))
+    f.close()
+    report_on_stats(stats_dict)
+    print('-' * 65)
+    print('statistics written to %r' % output_filename)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Fetch/push notes from/to a Simplenote (API v2 style) server, output in export format
+# Also see simplenote_sync_server.py for a local stand-in server (for offline testing/benchmarks)
+# Copyright (C) 2024 Chris Clark - clach04
+"""Sync client, writes the same json format as a Simplenote export so all the
+other tools work unchanged with the result.
+
+  * HTTP keep-alive, connections are pooled and reused
+  * bounded concurrency for individual note requests
+  * batched index requests, optionally including note content (fewer round trips)
+  * only changed since last sync; previous output is reused and only changed notes fetched
+  * retries with back off for connection errors, 429, and 5xx responses (creating
+    a note is only retried when the request was never sent, or was rejected with 429)
+
+Speaks the (legacy) Simplenote API v2 protocol:
+
+    POST /api/login                  body base64("email=...&password=...") -> token
+    GET  /api2/index?length=&mark=&since=&data=   -> {"count": n, "data": [note, ...], "mark": "..."}
+    GET  /api2/data/KEY              -> note
+    POST /api2/data/KEY              body json note -> note (update)
+    POST /api2/data                  body json note -> note (create)
+
+where note is {"key", "content", "createdate", "modifydate", "tags", "systemtags", "deleted", "version"}
+
+Usage:
+
+    env SIMPLENOTE_EMAIL=me@example.com SIMPLENOTE_PASSWORD=secret python simplenote_sync.py fetch simplenote_sync.json
+    env SIMPLENOTE_EMAIL=me@example.com SIMPLENOTE_PASSWORD=secret python simplenote_sync.py push changes.json
+
+Set SIMPLENOTE_API_URL to use a different server, e.g. http://127.0.0.1:8080 for simplenote_sync_server.py
+"""
+
+import base64
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import http.client as httplib
+    from urllib.parse import quote, urlencode, urlparse
+except ImportError:
+    # Python 2
+    import httplib
+    from urllib import quote, urlencode
+    from urlparse import urlparse
+
+try:
+    import queue
+except ImportError:
+    # Python 2
+    import Queue as queue
+
+import simplenote_common
+
+
+DEFAULT_API_URL = 'https://app.simplenote.com'
+SYSTEM_TAGS = ('pinned', 'markdown')  # systemtags that map to export booleans
+
+
+class SyncError(Exception):
+    def __init__(self, message, status=None):
+        Exception.__init__(self, message)
+        self.status = status
+
+
+def secs2iso_like(secs):
+    """Seconds since epoch (float) to Simplenote export timestamp format, e.g. "2022-06-27T01:39:12.602Z"
+    """
+    millisecs = int(round((secs - int(secs)) * 1000))
+    if millisecs == 1000:
+        secs, millisecs = int(secs) + 1, 0
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(int(secs))) + '.%03dZ' % millisecs
+
+def iso_like2float_secs(datetime_str):
+    """Like simplenote_common.iso_like2secs() but keeps milliseconds
+    """
+    fraction = datetime_str[:-1].rsplit('.', 1)
+    secs = float(simplenote_common.iso_like2secs(datetime_str))
+    if len(fraction) == 2:
+        secs += float('0.' + fraction[1])
+    return secs
+
+def api_note_to_export_note(api_note):
+    """Convert API note to export format (as returned by simplenote_common.load_file()), returns (note_entry, is_deleted)
+    """
+    note_entry = {
+        'id': api_note['key'],
+        'content': api_note.get('content', ''),
+        'creationDate': secs2iso_like(float(api_note.get('createdate') or api_note.get('modifydate') or 0)),
+        'lastModified': secs2iso_like(float(api_note.get('modifydate') or 0)),
+    }
+    tags = api_note.get('tags')
+    if tags:
+        note_entry['tags'] = tags
+    system_tags = api_note.get('systemtags') or []
+    for system_tag in SYSTEM_TAGS:
+        if system_tag in system_tags:
+            note_entry[system_tag] = True
+    return note_entry, bool(int(api_note.get('deleted') or 0))
+
+def export_note_to_api_note(note_entry, deleted=False):
+    api_note = {
+        'key': note_entry['id'],
+        'content': note_entry.get('content', ''),
+        'createdate': '%.6f' % iso_like2float_secs(note_entry['creationDate']),
+        'modifydate': '%.6f' % iso_like2float_secs(note_entry['lastModified']),
+        'tags': note_entry.get('tags', []),
+        'systemtags': [system_tag for system_tag in SYSTEM_TAGS if note_entry.get(system_tag)],
+        'deleted': deleted and 1 or 0,
+    }
+    return api_note
+
+
+class ConnectionPool(object):
+    """Pool of keep-alive HTTP(S) connections to a single host, at most size connections exist at once
+    """
+    def __init__(self, base_url, size=4, timeout=30.0):
+        parsed_url = urlparse(base_url)
+        self.use_ssl = parsed_url.scheme == 'https'
+        self.host = parsed_url.hostname
+        self.port = parsed_url.port
+        self.size = size
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()  # most recently used first, more likely to still be alive
+        self.semaphore = threading.BoundedSemaphore(size)
+        self.created_count = 0
+
+    def get(self):
+        self.semaphore.acquire()
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        self.created_count += 1
+        if self.use_ssl:
+            return httplib.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return httplib.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def put(self, connection, discard=False):
+        """Return connection to pool, discard (close) it if it is in an unknown state
+        """
+        if discard:
+            connection.close()
+        else:
+            self.idle.put(connection)
+        self.semaphore.release()
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class SimplenoteClient(object):
+    def __init__(self, email, password=None, token=None, api_url=DEFAULT_API_URL, max_connections=4, retries=3, backoff=0.5, batch_size=100, timeout=30.0):
+        self.email = email
+        self.password = password
+        self.token = token
+        self.api_url = api_url
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.pool = ConnectionPool(api_url, size=max_connections, timeout=timeout)
+        self.request_count = 0
+        self.retry_count = 0
+        self.login_lock = threading.Lock()  # auth_params() is called from map_concurrent() threads, only log in once
+
+    def close(self):
+        self.pool.close()
+
+    def request(self, method, path, params=None, body=None, idempotent=True):
+        """Returns response body (bytes), retries connection errors, 429 and 5xx responses
+        If not idempotent (e.g. create a note), once the request has been sent it is not retried
+        (the server may have acted on it), except for 429 which is a refusal
+        """
+        if params:
+            path = path + '?' + urlencode(params)
+        headers = {'Connection': 'keep-alive'}
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+        attempt = 0
+        while True:
+            attempt += 1
+            self.request_count += 1
+            connection = self.pool.get()
+            sent = False
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                sent = True
+                response = connection.getresponse()
+                response_body = response.read()  # always read all, so connection can be reused
+                status = response.status
+                discard = response.getheader('Connection', '').lower() == 'close'
+            except (httplib.HTTPException, IOError, OSError) as info:
+                self.pool.put(connection, discard=True)
+                if attempt > self.retries or (sent and not idempotent):
+                    raise SyncError('%s %s failed: %r' % (method, path, info))
+                self.retry_count += 1
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+                continue
+            self.pool.put(connection, discard=discard)
+            if status == 429 or status >= 500:
+                if attempt > self.retries or (status != 429 and not idempotent):
+                    raise SyncError('%s %s failed: HTTP %d' % (method, path, status), status=status)
+                self.retry_count += 1
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+                continue
+            if status >= 400:
+                raise SyncError('%s %s failed: HTTP %d' % (method, path, status), status=status)
+            return response_body
+
+    def auth_params(self, **kwargs):
+        if self.token is None:
+            self.login_lock.acquire()
+            try:
+                if self.token is None:
+                    self.login()
+            finally:
+                self.login_lock.release()
+        kwargs['auth'] = self.token
+        kwargs['email'] = self.email
+        return kwargs
+
+    def login(self):
+        body = base64.b64encode(urlencode({'email': self.email, 'password': self.password}).encode('utf-8'))
+        self.token = self.request('POST', '/api/login', body=body).decode('utf-8').strip()
+        return self.token
+
+    def iter_index(self, since=None, include_content=True):
+        """Generator of API notes, batch_size per request. NOTE without include_content notes have no "content"
+        """
+        mark = None
+        while True:
+            params = self.auth_params(length=self.batch_size)
+            if mark:
+                params['mark'] = mark
+            if since is not None:
+                params['since'] = '%.6f' % since
+            if include_content:
+                params['data'] = 'true'
+            index = json.loads(self.request('GET', '/api2/index', params=params).decode('utf-8'))
+            for api_note in index.get('data', []):
+                yield api_note
+            mark = index.get('mark')
+            if not mark:
+                break
+
+    def get_note(self, key):
+        return json.loads(self.request('GET', '/api2/data/' + quote(key, safe=''), params=self.auth_params()).decode('utf-8'))
+
+    def put_note(self, api_note):
+        """Update note, or create it if the server does not know the key. Returns note from server
+        A partial note without content (e.g. a deletion) is never created, returns None if the server does not know the key
+        """
+        body = json.dumps(api_note).encode('utf-8')
+        try:
+            return json.loads(self.request('POST', '/api2/data/' + quote(api_note['key'], safe=''), params=self.auth_params(), body=body).decode('utf-8'))
+        except SyncError as info:
+            if info.status != 404:
+                raise
+        if 'content' not in api_note:
+            return None  # nothing to delete
+        return json.loads(self.request('POST', '/api2/data', params=self.auth_params(), body=body, idempotent=False).decode('utf-8'))  # a retry could create a duplicate note
+
+    def map_concurrent(self, function, items):
+        """Call function for each item using at most max_connections threads, results in item order
+        """
+        if self.max_connections <= 1 or len(items) <= 1:
+            return [function(item) for item in items]
+        from multiprocessing.pool import ThreadPool  # only import when needed, start up time
+        pool = ThreadPool(self.max_connections)
+        try:
+            return pool.map(function, items)
+        finally:
+            pool.close()
+            pool.join()
+
+    def fetch_notes(self, since=None, include_content=True):
+        """Returns list of API notes changed since (seconds since epoch, None for all notes)
+        Index is fetched in batches, notes without content are then fetched individually (concurrently)
+        """
+        api_notes = list(self.iter_index(since=since, include_content=include_content))
+        missing = [position for position, api_note in enumerate(api_notes) if 'content' not in api_note]
+        fetched = self.map_concurrent(lambda position: self.get_note(api_notes[position]['key']), missing)
+        for position, api_note in zip(missing, fetched):
+            api_notes[position] = api_note
+        return api_notes
+
+    def push_notes(self, notes_dict):
+        """Push notes (export format) to server, activeNotes are created/updated, trashedNotes are marked deleted
+        (only key, deleted, and modifydate are sent, content on the server is kept so the note can be restored from trash)
+        Returns list of notes from server, None for deleted notes the server did not know
+        """
+        # pushing is a change, modifydate is now (not lastModified, e.g. an older file mtime from simplenote_text_sync)
+        # otherwise "only changed since" fetches, see fetch_to_export(), never see the pushed notes
+        now = '%.6f' % time.time()
+        api_notes = []
+        for note_entry in notes_dict['activeNotes']:
+            api_note = export_note_to_api_note(note_entry)
+            api_note['modifydate'] = now
+            api_notes.append(api_note)
+        for note_entry in notes_dict['trashedNotes']:
+            api_notes.append({'key': note_entry['id'], 'deleted': 1, 'modifydate': now})
+        self.auth_params()  # log in before starting threads
+        return self.map_concurrent(self.put_note, api_notes)
+
+
+def merge_api_notes(notes_dict, api_notes):
+    """Update notes_dict (export format) in place with changed API notes, returns notes_dict
+    """
+    changed = {}
+    for api_note in api_notes:
+        changed[api_note['key']] = api_note_to_export_note(api_note)
+    for section in ('activeNotes', 'trashedNotes'):
+        notes_dict[section] = [note_entry for note_entry in notes_dict.get(section, []) if note_entry['id'] not in changed]
+    for note_entry, is_deleted in changed.values():
+        if is_deleted:
+            notes_dict['trashedNotes'].append(note_entry)
+        else:
+            notes_dict['activeNotes'].append(note_entry)
+    return notes_dict
+
+def fetch_to_export(client, output_filename, incremental=True):
+    """Fetch notes and write export json. If output_filename already exists (and incremental), only notes changed since are fetched
+    Sync state (last modify date seen) is stored in OUTPUT_FILENAME.state
+    Returns number of changed notes
+    """
+    state_filename = output_filename + '.state'
+    notes_dict = {'activeNotes': [], 'trashedNotes': []}
+    since = None
+    if incremental and os.path.exists(output_filename) and os.path.exists(state_filename):
+        notes_dict = simplenote_common.load_file(output_filename)
+        f = open(state_filename, 'rb')
+        since = json.loads(f.read().decode('utf-8')).get('since')
+        f.close()
+
+    api_notes = client.fetch_notes(since=since)
+    merge_api_notes(notes_dict, api_notes)
+    for api_note in api_notes:
+        modifydate = float(api_note.get('modifydate') or 0)
+        if since is None or modifydate > since:
+            since = modifydate
+
+    tmp_filename = output_filename + '.tmp'
+    f = open(tmp_filename, 'wb')
+    f.write(json.dumps(notes_dict, indent=4).encode('utf-8'))
+    f.close()
+    if os.path.exists(output_filename):
+        os.remove(output_filename)  # Windows rename will not replace
+    os.rename(tmp_filename, output_filename)
+    f = open(state_filename, 'wb')
+    f.write(json.dumps({'since': since}).encode('utf-8'))
+    f.close()
+    return len(api_notes)
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    # FIXME proper command line argument processing needed
+    try:
+        command, filename = argv[1:3]
+    except ValueError:
+        print('Usage: %s fetch|push FILENAME' % argv[0])
+        return 1
+
+    client = SimplenoteClient(
+        os.environ['SIMPLENOTE_EMAIL'],
+        password=os.environ.get('SIMPLENOTE_PASSWORD'),
+        token=os.environ.get('SIMPLENOTE_TOKEN'),
+        api_url=os.environ.get('SIMPLENOTE_API_URL', DEFAULT_API_URL),
+        max_connections=int(os.environ.get('SIMPLENOTE_MAX_CONNECTIONS', 4)),
+    )
+    start_time = time.time()
+    try:
+        if command == 'fetch':
+            changed_count = fetch_to_export(client, filename)
+            print('%d changed notes, written to %r' % (changed_count, filename))
+        elif command == 'push':
+            notes_dict = simplenote_common.load_file(filename)
+            pushed = client.push_notes(notes_dict)
+            print('%d notes pushed' % len([api_note for api_note in pushed if api_note is not None]))
+        else:
+            print('Usage: %s fetch|push FILENAME' % argv[0])
+            return 1
+    finally:
+        client.close()
+    print('%d requests (%d retries) over %d connections in %.2f seconds' % (client.request_count, client.retry_count, client.pool.created_count, time.time() - start_time))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
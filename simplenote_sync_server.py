@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Local (in-process) stand-in for the Simplenote API v2 server, for offline testing and benchmarks of simplenote_sync.py
+# Copyright (C) 2024 Chris Clark - clach04
+"""Minimal stand-in server, implements only what simplenote_sync.py uses.
+HTTP/1.1 with keep-alive, one thread per connection.
+
+Fault/latency injection for testing client retries and throughput:
+
+  * fail_every - every Nth request gets a 503 response (0 disables)
+  * latency - seconds to sleep before each response
+
+Usage, serve an export (json or zip) on a port:
+
+    python simplenote_sync_server.py note.zip 8080
+    env SIMPLENOTE_API_URL=http://127.0.0.1:8080 SIMPLENOTE_EMAIL=user@example.com SIMPLENOTE_PASSWORD=x python simplenote_sync.py fetch copy.json
+
+Or in-process, see start_server()
+"""
+
+import base64
+import json
+import socket
+import sys
+import threading
+import time
+import uuid
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, unquote, urlparse
+except ImportError:
+    # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urllib import unquote
+    from urlparse import parse_qs, urlparse
+
+import simplenote_common
+import simplenote_sync
+
+
+class StandInState(object):
+    """Notes held by the server (API format, key -> note) plus counters
+    """
+    def __init__(self, api_notes=None, fail_every=0, latency=0.0):
+        self.lock = threading.Lock()
+        self.notes = {}
+        for api_note in api_notes or []:
+            self.notes[api_note['key']] = api_note
+        self.tokens = {}  # token -> email
+        self.fail_every = fail_every
+        self.latency = latency
+        self.request_count = 0
+        self.failure_count = 0
+        self.connection_count = 0
+
+    def count_request(self):
+        """Returns True if this request should fail (fault injection)
+        """
+        with self.lock:
+            self.request_count += 1
+            if self.fail_every and self.request_count % self.fail_every == 0:
+                self.failure_count += 1
+                return True
+        return False
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # headers and body are separate writes, avoid Nagle/delayed ACK stalls
+        with self.server.state.lock:
+            self.server.state.connection_count += 1
+
+    def log_message(self, format, *args):
+        pass  # quiet, benchmarks make lots of requests
+
+    def send_body(self, status, body, content_type='application/json'):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length)
+
+    def check_request(self):
+        """Returns (path, params) or None if a response has already been sent
+        """
+        state = self.server.state
+        parsed_url = urlparse(self.path)
+        params = dict((key, values[0]) for key, values in parse_qs(parsed_url.query).items())
+        if state.latency:
+            time.sleep(state.latency)
+        if state.count_request():
+            self.read_body()
+            self.send_body(503, {'error': 'injected failure'})
+            return None
+        if parsed_url.path != '/api/login' and state.tokens.get(params.get('auth')) != params.get('email'):
+            self.read_body()
+            self.send_body(401, {'error': 'not authorized'})
+            return None
+        return parsed_url.path, params
+
+    def do_GET(self):
+        request = self.check_request()
+        if request is None:
+            return
+        path, params = request
+        state = self.server.state
+        if path == '/api2/index':
+            length = int(params.get('length', 100))
+            since = float(params.get('since', 0) or 0)
+            include_content = params.get('data') == 'true'
+            with state.lock:
+                keys = sorted(key for key, api_note in state.notes.items() if float(api_note['modifydate']) > since)
+                start = int(params.get('mark') or 0)
+                batch = []
+                for key in keys[start:start + length]:
+                    api_note = dict(state.notes[key])
+                    if not include_content:
+                        del api_note['content']
+                    batch.append(api_note)
+            index = {'count': len(batch), 'data': batch, 'time': '%.6f' % time.time()}
+            if start + length < len(keys):
+                index['mark'] = str(start + length)
+            self.send_body(200, index)
+        elif path.startswith('/api2/data/'):
+            key = unquote(path[len('/api2/data/'):])
+            with state.lock:
+                api_note = state.notes.get(key)
+            if api_note is None:
+                self.send_body(404, {'error': 'not found'})
+            else:
+                self.send_body(200, api_note)
+        else:
+            self.send_body(404, {'error': 'not found'})
+
+    def do_POST(self):
+        request = self.check_request()
+        if request is None:
+            return
+        path, params = request
+        state = self.server.state
+        body = self.read_body()
+        if path == '/api/login':
+            credentials = parse_qs(base64.b64decode(body).decode('utf-8'))
+            token = uuid.uuid4().hex
+            with state.lock:
+                state.tokens[token] = credentials['email'][0]
+            self.send_body(200, token.encode('utf-8'), content_type='text/plain')
+            return
+        if path == '/api2/data' or path.startswith('/api2/data/'):
+            api_note = json.loads(body.decode('utf-8'))
+            key = unquote(path[len('/api2/data/'):]) if path.startswith('/api2/data/') else None
+            with state.lock:
+                if key is not None and key not in state.notes:
+                    self.send_body(404, {'error': 'not found'})
+                    return
+                if key is None:
+                    key = uuid.uuid4().hex  # server assigns ids for new notes
+                existing = state.notes.get(key, {'version': 0})
+                existing = dict(existing)
+                existing.update(api_note)
+                existing['key'] = key
+                existing['version'] = existing.get('version', 0) + 1
+                existing['modifydate'] = api_note.get('modifydate') or '%.6f' % time.time()
+                state.notes[key] = existing
+            self.send_body(200, existing)
+            return
+        self.send_body(404, {'error': 'not found'})
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start_server(notes_dict=None, host='127.0.0.1', port=0, fail_every=0, latency=0.0):
+    """Start stand-in server in a background thread, port 0 picks a free port
+    notes_dict is in export format (as returned by simplenote_common.load_file())
+    Returns server, with server.base_url and server.state. Stop with server.shutdown()
+    """
+    api_notes = []
+    if notes_dict:
+        api_notes = [simplenote_sync.export_note_to_api_note(note_entry) for note_entry in notes_dict['activeNotes']]
+        api_notes += [simplenote_sync.export_note_to_api_note(note_entry, deleted=True) for note_entry in notes_dict['trashedNotes']]
+        for api_note in api_notes:
+            api_note['version'] = 1
+    server = StandInServer((host, port), StandInHandler)
+    server.state = StandInState(api_notes, fail_every=fail_every, latency=latency)
+    server.base_url = 'http://%s:%d' % server.server_address[:2]
+    thread = threading.Thread(target=server.serve_forever, name='simplenote_standin_server')
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    # FIXME proper command line argument processing needed
+    notes_dict = None
+    if len(argv) > 1:
+        notes_dict = simplenote_common.load_file(argv[1])
+    port = 8080
+    if len(argv) > 2:
+        port = int(argv[2])
+    server = start_server(notes_dict, port=port)
+    print('serving %d notes on %s, Ctrl-C to stop' % (len(server.state.notes), server.base_url))
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Generate SimpleNote json file for import with only the notes changed since a text export
+# Also see related scripts simplenote_export2txt.py and files_to_simplenotesjson.py
+# Copyright (C) 2024 Chris Clark - clach04
+"""Reverse of simplenote_export2txt, for a directory created by dict2txt() (with the index saved)
+
+Uses the index (simplenote_index.json, simplenote_index.ndjson, or simplenote_index.snidx) to find
+which text files were edited, added, or deleted since the export and
+generates an import json with only those notes:
+
+  * edited - original id and metadata kept, new content and lastModified
+  * added - new id, like files_to_simplenotesjson
+  * deleted - placed in trashedNotes with original id and metadata, content is empty (the index does not hold active note content)
+
+Files whose last modified time still matches the note lastModified are not
+read at all, only a directory listing is needed. Files with a different
+time are read and compared with the content hash from the index, so a file
+that was only touched is not reported.
+
+NOTE only does a single directory, not nested/sub-directories
+"""
+
+import datetime
+import json
+import os
+import sys
+import time
+
+import files_to_simplenotesjson
+import sanity_check_export
+import simplenote_common
+import simplenote_index
+
+
+EDITED = 'edited'
+ADDED = 'added'
+DELETED = 'deleted'
+
+INDEX_ONLY_KEYS = ('filename', 'path', 'content_sha1')  # added by simplenote_export2txt.note_to_index_entry(), not part of a Simplenote note
+
+
+def load_index(directory):
+    """Returns dict of note id -> index metadata for active notes, from binary, NDJSON, or json index
+    """
+    filename = os.path.join(directory, simplenote_index.BINARY_INDEX_FILENAME)
+    if os.path.exists(filename):
+        index = simplenote_index.BinaryIndex(filename)
+        try:
+            return index.to_dict()['activeNotes']
+        finally:
+            index.close()
+    filename = os.path.join(directory, simplenote_index.NDJSON_INDEX_FILENAME)
+    if os.path.exists(filename):
+        return dict((note_entry['id'], note_entry) for note_entry in simplenote_common.load_ndjson(filename)['activeNotes'])
+    f = open(os.path.join(directory, simplenote_index.JSON_INDEX_FILENAME), 'rb')
+    json_bytes = f.read()
+    f.close()
+    return json.loads(json_bytes)['activeNotes']
+
+def iter_directory(directory):
+    """Generator of (filename, mtime) for regular files in directory, uses scandir when available (no extra stat on Windows)
+    """
+    if hasattr(os, 'scandir'):
+        for entry in os.scandir(directory):
+            if entry.is_file():
+                yield entry.name, entry.stat().st_mtime
+    else:
+        # Python 2
+        for filename in os.listdir(directory):
+            filename_full = os.path.join(directory, filename)
+            if os.path.isfile(filename_full):
+                yield filename, os.path.getmtime(filename_full)
+
+def find_changes(directory, file_extension='txt'):
+    """Returns list of (change type, note id (None for added), filename) for text files changed since the export
+    """
+    active_notes = load_index(directory)
+    extension = '.' + file_extension if file_extension else ''
+    directory_listing = list(iter_directory(directory))
+    # older indexes do not record the name on disk ("path"), either all id or all first line based filenames, see simplenote_export2txt.note_to_filename()
+    id_filenames = set(note_id + extension for note_id in active_notes)
+    use_id_filenames = not active_notes or any(filename in id_filenames for filename, _mtime in directory_listing)
+    expected = {}  # filename on disk -> note id, exactly one name per note
+    for note_id, index_entry in active_notes.items():
+        filename = index_entry.get('path')
+        if filename is None:
+            if use_id_filenames:
+                filename = note_id + extension
+            else:
+                filename = index_entry['filename'] + extension
+            index_entry['path'] = filename
+        expected[filename] = note_id
+
+    changes = []
+    seen = set()
+    for filename, mtime in directory_listing:
+        if extension and not filename.endswith(extension):
+            continue
+        note_id = expected.get(filename)
+        if note_id is None:
+            changes.append((ADDED, None, filename))
+            continue
+        seen.add(note_id)
+        index_entry = active_notes[note_id]
+        if int(mtime) == simplenote_common.iso_like2secs(index_entry['lastModified']):
+            continue  # unchanged, dict2txt() sets mtime to lastModified - no need to read the file
+        f = open(os.path.join(directory, filename), 'rb')
+        content = f.read().decode('utf-8')
+        f.close()
+        if sanity_check_export.hash_note_content(content) == index_entry.get('content_sha1'):
+            continue  # touched, but same content
+        changes.append((EDITED, note_id, filename))
+
+    for note_id in active_notes:
+        if note_id not in seen:
+            changes.append((DELETED, note_id, active_notes[note_id]['path']))
+    return changes, active_notes
+
+def changes_to_notes_dict(directory, changes, active_notes):
+    """Returns notes dict (same format as simplenote_common.load_file()) for import
+    """
+    result = {
+        'activeNotes': [],
+        'trashedNotes': [],  # NOTE required, web interface will silently crash if missing (error in debug console, but nothing in UI).
+    }
+    for change_type, note_id, filename in changes:
+        if change_type == ADDED:
+            result['activeNotes'].append(files_to_simplenotesjson.filename_to_entry(os.path.join(directory, filename)))
+            continue
+        note_entry = dict((key, value) for key, value in active_notes[note_id].items() if key not in INDEX_ONLY_KEYS)
+        if change_type == EDITED:
+            filename_full = os.path.join(directory, filename)
+            f = open(filename_full, 'rb')
+            note_entry['content'] = f.read().decode('utf-8')
+            f.close()
+            note_entry['lastModified'] = time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(os.path.getmtime(filename_full)))  # UTC / GMT
+            result['activeNotes'].append(note_entry)
+        else:
+            note_entry['content'] = ''
+            result['trashedNotes'].append(note_entry)
+    return result
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    # FIXME proper command line argument processing needed
+    directory = argv[1]
+    now = datetime.datetime.now()
+    try:
+        output_filename = argv[2]
+    except IndexError:
+        output_filename = os.environ.get('SIMPLENOTE_EXPORT_FILENAME', 'simplenote_changes_%s.json' % now.strftime('%Y%m%d_%H%M%S'))
+
+    changes, active_notes = find_changes(directory)
+    for change_type, note_id, filename in changes:
+        print('%-8s %s %r' % (change_type, note_id or '', filename))
+    print('%d changes, %d notes in index' % (len(changes), len(active_notes)))
+    if not changes:
+        return 0
+
+    notes_dict = changes_to_notes_dict(directory, changes, active_notes)
+    print('to export %r' % output_filename)
+    f = open(output_filename, 'wb')
+    f.write(json.dumps(notes_dict, indent=4).encode('utf-8'))
+    f.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
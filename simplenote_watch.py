@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: us-ascii -*-
+# vim:ts=4:sw=4:softtabstop=4:smarttab:expandtab
+#
+# Watch a directory for new Simplenote exports/backups and (re-)export to text files
+# Also see related script simplenote_export2txt.py
+# Copyright (C) 2024 Chris Clark - clach04
+"""Long running watch/daemon mode for simplenote_export2txt
+
+Polls watch directory for new or changed *.zip and *.json exports (uses inotify,
+via https://github.com/chrisjbillington/inotify_simple, if available to avoid
+waiting a full poll interval). When one shows up the text export is updated in a
+single (stable) output directory.
+
+  * bursts of new files are coalesced, only the newest export is processed
+  * files still being written (size/mtime changing, or incomplete zip/json) are skipped until they settle
+  * previous export is kept in memory, only new/changed notes are written and removed notes are deleted
+
+NOTE the first export processed is always a full export. Files from a previous
+run are known from the index in the output directory (any format, see
+simplenote_text_sync.load_index()), so notes deleted or renamed since are
+removed. Without an index stale files are NOT removed.
+"""
+
+import fnmatch
+import os
+import sys
+import time
+from zipfile import BadZipfile
+
+try:
+    import inotify_simple  # pip install inotify_simple
+except ImportError:
+    inotify_simple = None
+
+import sanity_check_export
+import simplenote_common
+import simplenote_export2txt
+import simplenote_text_sync
+
+
+EXCLUDE_PATTERNS = ('*.stats.json', '*.state')  # written next to exports by simplenote_stats.py and simplenote_sync.py
+
+
+class ExportWatcher(object):
+    def __init__(self, watch_directory, output_directory, patterns=('*.zip', '*.json'), exclude_patterns=EXCLUDE_PATTERNS, poll_interval=5.0, settle_time=2.0, use_first_line_as_filename=False, file_extension='txt', save_index=True, save_index_include_trashed=True, index_format='json'):
+        self.watch_directory = watch_directory
+        self.output_directory = output_directory
+        self.patterns = patterns
+        self.exclude_patterns = exclude_patterns
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.use_first_line_as_filename = use_first_line_as_filename
+        self.file_extension = file_extension
+        self.save_index = save_index
+        self.save_index_include_trashed = save_index_include_trashed
+        self.index_format = index_format
+
+        self.processed = {}  # filename -> (size, mtime) of exports already handled (or ignored as part of a burst)
+        self.pending = {}  # filename -> ((size, mtime), time first seen with that signature)
+        self.previous_notes = {}  # id -> note entry (with '\r' removed from content) from last export processed
+        self.previous_filenames = self.load_previous_filenames()  # id -> filename on disk from last export processed
+        self.inotify = None
+        if inotify_simple:
+            self.inotify = inotify_simple.INotify()
+            watch_flags = inotify_simple.flags.CLOSE_WRITE | inotify_simple.flags.MOVED_TO | inotify_simple.flags.CREATE
+            self.inotify.add_watch(watch_directory, watch_flags)
+
+    def load_previous_filenames(self):
+        """Returns dict of note id -> filename on disk from the index of a previous run in output_directory, empty if there is no index
+        """
+        try:
+            active_notes = simplenote_text_sync.load_index(self.output_directory)
+        except (IOError, OSError, ValueError):
+            return {}  # no (readable) index
+        extension = '.' + self.file_extension if self.file_extension else ''
+        result = {}
+        for note_id, index_entry in active_notes.items():
+            filename = index_entry.get('path')
+            if filename is None:
+                # older index, assume same filename setting as this run
+                if self.use_first_line_as_filename:
+                    filename = index_entry['filename'] + extension
+                else:
+                    filename = note_id + extension
+            result[note_id] = filename
+        return result
+
+    def scan(self):
+        """Returns dict of filename -> (size, mtime) for candidate exports in watch directory
+        """
+        result = {}
+        for filename in os.listdir(self.watch_directory):
+            for pattern in self.patterns:
+                if fnmatch.fnmatch(filename.lower(), pattern):
+                    break
+            else:
+                continue
+            if any(fnmatch.fnmatch(filename.lower(), pattern) for pattern in self.exclude_patterns):
+                continue
+            filename_full = os.path.join(self.watch_directory, filename)
+            try:
+                file_status = os.stat(filename_full)
+            except OSError:
+                continue  # removed since listdir()
+            if not os.path.isfile(filename_full):
+                continue
+            result[filename_full] = (file_status.st_size, file_status.st_mtime)
+        return result
+
+    def ready_exports(self, now=None):
+        """Returns list of (mtime, filename) for new/changed exports that have settled, oldest first
+        """
+        now = now or time.time()
+        current = self.scan()
+        result = []
+        for filename, signature in current.items():
+            if self.processed.get(filename) == signature:
+                continue
+            pending_signature, first_seen = self.pending.get(filename, (None, None))
+            if pending_signature != signature:
+                # new or still being written, start (re)timing
+                self.pending[filename] = (signature, now)
+                continue
+            if now - first_seen >= self.settle_time:
+                result.append((signature[1], filename))
+        for filename in list(self.pending.keys()):
+            if filename not in current:
+                del self.pending[filename]
+        result.sort()
+        return result
+
+    def poll_once(self, now=None):
+        """Check for new exports and process the newest one, returns filename processed or None
+        """
+        ready = self.ready_exports(now=now)
+        # coalesce bursts, newest first, older ones ignored (they are superseded)
+        while ready:
+            mtime, filename = ready.pop()
+            signature = self.pending.pop(filename)[0]
+            try:
+                notes_dict = simplenote_common.load_file(filename)
+            except (BadZipfile, KeyError, ValueError) as info:
+                # most likely still being written (or not a Simplenote export), try again later
+                print('skipping %r, not (yet) a valid export: %r' % (filename, info))
+                continue
+            self.processed[filename] = signature
+            violations = sanity_check_export.validate_notes_dict(notes_dict, allow_unexpected_keys=True)
+            if violations:
+                # complete file (it parsed) but not a Simplenote export, marked as processed so it is not retried until it changes
+                print('ignoring %r, not a Simplenote export:' % filename)
+                sanity_check_export.report_on_violations(violations, max_report=5)
+                continue
+            for _dummy, older_filename in ready:
+                print('skipping %r, superseded by %r' % (older_filename, filename))
+                self.processed[older_filename] = self.pending.pop(older_filename)[0]
+            self.export(notes_dict)
+            return filename
+        return None
+
+    def export(self, notes_dict):
+        """Update output directory with notes_dict, only writing notes that changed since previous export
+        Returns tuple of (written, removed) counts
+        """
+        output_directory = self.output_directory
+        simplenote_common.safe_mkdir(output_directory)
+        for note_entry in notes_dict['activeNotes']:
+            note_entry['content'] = note_entry['content'].replace('\r', '')  # same newline handling as simplenote_export2txt.dict2txt()
+        dupe_dict = sanity_check_export.find_duplicate_filenames_dict(notes_dict, generate_file_name=sanity_check_export.safe_filename)
+        if self.save_index:
+            new_index = {
+                'activeNotes': {},  # this will be the note metadata without the content (and additional "filename")
+            }
+            if self.save_index_include_trashed:
+                new_index['trashedNotes'] = notes_dict['trashedNotes']  # include trashed/deleted notes, including actual content
+
+        current_notes = {}
+        current_filenames = {}
+        written_count = 0
+        for note_entry in notes_dict['activeNotes']:
+            note_id = note_entry['id']
+            filename, safe_filename = simplenote_export2txt.note_to_filename(note_entry, dupe_dict, use_first_line_as_filename=self.use_first_line_as_filename, file_extension=self.file_extension)
+            if self.previous_notes.get(note_id) != note_entry or self.previous_filenames.get(note_id) != filename:
+                simplenote_export2txt.write_note_file(os.path.join(output_directory, filename), note_entry)
+                written_count += 1
+            current_notes[note_id] = note_entry
+            current_filenames[note_id] = filename
+            if self.save_index:
+                new_index['activeNotes'][note_id] = simplenote_export2txt.note_to_index_entry(note_entry, safe_filename, filename=filename)
+
+        # remove notes that were deleted or renamed
+        removed_count = 0
+        in_use_filenames = set(current_filenames.values())
+        for note_id, filename in self.previous_filenames.items():
+            if filename not in in_use_filenames:
+                try:
+                    os.remove(os.path.join(output_directory, filename))
+                    removed_count += 1
+                except OSError:
+                    pass  # already gone
+
+        if self.save_index:
+            simplenote_export2txt.write_index_file(new_index, output_directory, index_format=self.index_format)
+
+        self.previous_notes = current_notes
+        self.previous_filenames = current_filenames
+        print('%d notes written, %d notes removed, %d unchanged' % (written_count, removed_count, len(current_notes) - written_count))
+        return written_count, removed_count
+
+    def wait(self):
+        """Wait for next poll, returns early if inotify reports activity
+        """
+        if self.inotify:
+            self.inotify.read(timeout=int(self.poll_interval * 1000))
+            return
+        time.sleep(self.poll_interval)
+
+    def run(self, max_iterations=None):
+        iteration_count = 0
+        while max_iterations is None or iteration_count < max_iterations:
+            filename = self.poll_once()
+            if filename:
+                print('exported %r to %r' % (filename, self.output_directory))
+            iteration_count += 1
+            if self.pending:
+                # something is still settling, check again once it should be stable
+                time.sleep(min(self.poll_interval, self.settle_time))
+            else:
+                self.wait()
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv
+
+    print('Python %s on %s' % (sys.version, sys.platform))
+
+    # FIXME proper command line argument processing needed
+    watch_directory = argv[1]
+    try:
+        output_directory = argv[2]
+    except IndexError:
+        output_directory = os.path.join(watch_directory, 'simplenote_latest_export_dir')
+    use_first_line_as_filename = simplenote_common.force_bool(os.environ.get('SIMPLENOTE_READABLE_FILENAMES', False))
+    save_index = simplenote_common.force_bool(os.environ.get('SIMPLENOTE_SAVE_INDEX', True))  # default is to save everything
+    save_index_include_trashed = simplenote_common.force_bool(os.environ.get('SIMPLENOTE_SAVE_INDEX_TRASHED', True))  # default is to save everything
+    index_format = os.environ.get('SIMPLENOTE_INDEX_FORMAT', 'json')  # json, ndjson, or binary
+    poll_interval = float(os.environ.get('SIMPLENOTE_WATCH_INTERVAL', 5.0))  # seconds
+    settle_time = float(os.environ.get('SIMPLENOTE_WATCH_SETTLE', 2.0))  # seconds a file must be unchanged before it is processed
+
+    print('watching %r, exporting to %r (inotify %s)' % (watch_directory, output_directory, inotify_simple and 'enabled' or 'unavailable, polling'))
+    watcher = ExportWatcher(watch_directory, output_directory, poll_interval=poll_interval, settle_time=settle_time, use_first_line_as_filename=use_first_line_as_filename, save_index=save_index, save_index_include_trashed=save_index_include_trashed, index_format=index_format)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print('stopped')
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())